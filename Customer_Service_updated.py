@@ -1,8 +1,11 @@
-import csv
+import os
+import glob
 import time
+import argparse
 from datetime import datetime
 from urllib.parse import quote_plus
-from typing import Set, List, Tuple
+from functools import partial
+from typing import Set, List, Tuple, Dict
 
 
 # Customer_Service_updated.py
@@ -12,40 +15,57 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from search_parser import parse_search_cards, parse_profile_top_card
+from location_rules import is_us_location
+from keyword_matcher import KeywordMatcher
+from profile_pool import ProfileEnrichmentPool, scrape_top_card
+from page_cache import PageCache
+from url_index import UrlIndex
+from lead_store import RunCheckpoint, read_column, count_rows
+from lead_record import LeadRecord, CsvLeadWriter, ParquetLeadWriter, utc_now
+from scraper_cli import add_common_args, parse_args, page_range, configure_chrome, ensure_login, close_browser
+from scroll_control import scroll_until_stable, log_scroll
+from run_metrics import RunMetrics, COUNT_BUCKETS
+
 # ====== CONFIG ======
 KEYWORD = "Small Business Owner"
 USA_GEO_URN = "103644278"  # United States facet
-TS = datetime.now().strftime("%Y%m%d_%H%M%S")
 SAFE_KW = KEYWORD.lower().replace(" ", "_")  # Safe for filenames
-CSV_BEFORE = f"{SAFE_KW}_us_before_{TS}.csv"
-CSV_AFTER  = f"{SAFE_KW}_us_after_{TS}.csv"
+KEYWORD_MATCHER = KeywordMatcher([KEYWORD])
+SOURCE = "customer_service"  # LeadRecord.source; also the CSV layout name
+FLUSH_EVERY = 10  # rows buffered between fsyncs; every page end is flushed and checkpointed
 
 LOAD_WAIT_SEC = 20
 SCROLL_ROUNDS = 10
-SCROLL_PAUSE_SEC = 1.0
-
-# US detection helper: accept US even when “United States” isn’t printed
-US_STATE_ABBR = {
-    "AL","AK","AZ","AR","CA","CO","CT","DC","DE","FL","GA","HI","IA","ID","IL","IN","KS","KY","LA","MA","MD",
-    "ME","MI","MN","MO","MS","MT","NC","ND","NE","NH","NJ","NM","NV","OH","OK","OR","PA","RI","SC","SD","TN",
-    "TX","UT","VA","VT","WA","WI","WV","WY","PR","GU","VI"
-}
-US_STATE_FULL = {
-    "alabama","alaska","arizona","arkansas","california","colorado","connecticut","delaware","florida","georgia",
-    "hawaii","idaho","illinois","indiana","iowa","kansas","kentucky","louisiana","maine","maryland","massachusetts",
-    "michigan","minnesota","mississippi","missouri","montana","nebraska","nevada","new hampshire","new jersey",
-    "new mexico","north carolina","north dakota","ohio","oklahoma","oregon","pennsylvania","rhode island",
-    "south carolina","south dakota","tennessee","texas","utah","vermont","virginia","washington","west virginia",
-    "wisconsin","wyoming","district of columbia","washington, d.c.","washington dc","d.c.","dc"
-}
-EXCLUDE_TOKENS = {"new york", ", ny", " ny,", " ny "}  # exclude NY by text
+SCROLL_QUIET_SEC = 0.5          # DOM must be quiet this long after a scroll before re-measuring
+SCROLL_ROUND_TIMEOUT_SEC = 3.0  # upper bound per scroll round
+RESULT_CARD_CSS = "li.reusable-search__result-container"
+
 MAX_PROFILE_OPENS = 80  # safety cap to avoid opening too many profile tabs
+ENRICH_WORKERS = 3  # parallel browser sessions for profile opens (0 = open tabs serially in the main browser)
+PROFILE_OPEN_INTERVAL_SEC = 1.0  # global spacing between profile opens across all workers
+OFFLINE_PARSE = True  # parse cards from one page_source snapshot instead of per-field WebDriver calls
+PAGE_CACHE_PATH = "page_cache.sqlite"  # shared with the other scrapers; --replay reads only from it
+PAGE_CACHE_TTL_HOURS = 24
+URL_INDEX_PATH = "url_index.sqlite"  # profiles handled by earlier runs are skipped
+
+metrics = RunMetrics("customer_service")  # stage timers/counters, written at the end of main()
 # ====================
 
-def login_to_linkedin(driver):
-    driver.get("https://www.linkedin.com/login")
-    print("🔐 Log in manually in the browser window.")
-    input("✅ When you’re on the LinkedIn home feed, press Enter here to continue...")
+def output_paths(run_id: str) -> Tuple[str, str, str]:
+    """BEFORE csv, AFTER csv and checkpoint for a run; a resumed run reuses the same files."""
+    return (f"{SAFE_KW}_us_before_{run_id}.csv",
+            f"{SAFE_KW}_us_after_{run_id}.csv",
+            f"{SAFE_KW}_us_{run_id}.checkpoint.json")
+
+def latest_run_id():
+    checkpoints = glob.glob(f"{SAFE_KW}_us_*.checkpoint.json")
+    if not checkpoints:
+        return None
+    return RunCheckpoint(max(checkpoints, key=os.path.getmtime)).state.get("run_id")
+
+def login_to_linkedin(driver, args):
+    return ensure_login(driver, args, "✅ When you’re on the LinkedIn home feed, press Enter here to continue...")
 
 def build_search_url(page: int) -> str:
     q = quote_plus(f'"{KEYWORD}"')  # quoted for stable matching
@@ -59,26 +79,34 @@ def build_search_url(page: int) -> str:
 
 def wait_for_results(driver):
     wait = WebDriverWait(driver, LOAD_WAIT_SEC)
-    for locator in [
-        (By.CSS_SELECTOR, "ul.reusable-search__entity-result-list"),
-        (By.XPATH, "//li[contains(@class,'reusable-search__result-container')]"),
-        (By.XPATH, "//*[contains(@class,'search-results-container')]"),
+    for label, locator in [
+        ("result_list", (By.CSS_SELECTOR, "ul.reusable-search__entity-result-list")),
+        ("result_card", (By.XPATH, "//li[contains(@class,'reusable-search__result-container')]")),
+        ("results_container", (By.XPATH, "//*[contains(@class,'search-results-container')]")),
     ]:
         try:
             wait.until(EC.presence_of_element_located(locator))
             return
         except:
+            metrics.incr("wait_timeouts", locator=label)
             continue
 
 def scroll_results(driver):
-    last_h = 0
-    for _ in range(SCROLL_ROUNDS):
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(SCROLL_PAUSE_SEC)
-        new_h = driver.execute_script("return document.body.scrollHeight")
-        if new_h == last_h:
-            break
-        last_h = new_h
+    # Stops once height and card count stop changing, instead of sleeping a fixed pause per round
+    return scroll_until_stable(driver, count_css=RESULT_CARD_CSS, max_rounds=SCROLL_ROUNDS,
+                               quiet_sec=SCROLL_QUIET_SEC, round_timeout=SCROLL_ROUND_TIMEOUT_SEC)
+
+def load_search_page(driver, url: str) -> str:
+    with metrics.stage("page_load"):
+        driver.get(url)
+    t0 = time.perf_counter()
+    with metrics.stage("wait_results"):
+        wait_for_results(driver)
+    with metrics.stage("scroll"):
+        result = scroll_results(driver)
+    metrics.incr("scroll_rounds", result.rounds)
+    log_scroll("search page", result._replace(seconds=time.perf_counter() - t0))
+    return driver.page_source
 
 def text_safe(root, by, sel) -> str:
     try:
@@ -110,75 +138,20 @@ def closest_card(link_el):
     return None
 
 def location_is_us_not_ny(location_text: str) -> bool:
-    if not location_text:
-        return False
-    loc = location_text.lower()
-
-    # Exclude New York explicitly
-    for bad in EXCLUDE_TOKENS:
-        if bad in loc:
-            return False
-
-    # Accept if explicitly mentions US
-    if "united states" in loc or "u.s." in loc or "usa" in loc:
-        return True
-
-    # Accept if contains state full name (except New York, handled above)
-    for st in US_STATE_FULL:
-        if st in loc:
-            if st == "new york":
-                return False
-            return True
-
-    # Accept if ends with a state abbreviation like ", CA"
-    if ", " in loc:
-        abbr = loc.split(",")[-1].strip().upper()
-        if abbr in US_STATE_ABBR and abbr != "NY":
-            return True
-
-    return False
+    # Shared rules (states, abbreviations, NY exclusion) live in location_rules.py
+    return is_us_location(location_text)
 
 def headline_or_name_has_kw(headline: str, name: str) -> bool:
-    kw = KEYWORD.lower()
-    return (kw in (headline or "").lower()) or (kw in (name or "").lower())
+    return KEYWORD_MATCHER(headline, name)
 
-def open_profile_and_scrape(driver, url: str) -> Tuple[str, str, str]:
+def open_profile_and_scrape(driver, url: str, cache=None) -> Tuple[str, str, str]:
     """Open profile in a background tab; scrape name/headline/location from top card."""
     try:
         driver.execute_script("window.open(arguments[0], '_blank');", url)
         driver.switch_to.window(driver.window_handles[-1])
-        WebDriverWait(driver, 12).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        time.sleep(3)
-
-        # Name
-        name = ""
-        for sel in [
-            (By.CSS_SELECTOR, "h1"),
-            (By.CSS_SELECTOR, "div.ph5 h1"),
-            (By.CSS_SELECTOR, "[data-test-profile-card-headline] h1"),
-        ]:
-            name = text_safe(driver, *sel)
-            if name: break
-
-        # Headline
-        headline = ""
-        for sel in [
-            (By.CSS_SELECTOR, "div.text-body-medium.break-words"),
-            (By.CSS_SELECTOR, "div.text-body-medium"),
-            (By.XPATH, "//div[contains(@class,'pv-text-details__left-panel')]/div[1]"),
-        ]:
-            headline = text_safe(driver, *sel)
-            if headline: break
-
-        # Location
-        location = ""
-        for sel in [
-            (By.CSS_SELECTOR, "span.text-body-small.inline.t-black--light.break-words"),
-            (By.XPATH, "//span[contains(@class,'text-body-small') and contains(.,',')]"),
-            (By.XPATH, "//div[contains(@class,'pv-text-details__left-panel')]//span[contains(@class,'text-body-small')]"),
-        ]:
-            location = text_safe(driver, *sel)
-            if location: break
+        name, headline, location = scrape_top_card(driver)
+        if cache is not None:
+            cache.put(url, driver.page_source)
 
         # Close the tab and return
         driver.close()
@@ -194,110 +167,276 @@ def open_profile_and_scrape(driver, url: str) -> Tuple[str, str, str]:
             pass
         return "", "", ""
 
-def scrape_pages(driver, start_page: int, end_page: int):
-    seen_all: Set[str] = set()
-    seen_after: Set[str] = set()
-    rows_before: List[List[str]] = []
-    rows_after:  List[List[str]] = []
+def extract_cards_selenium(driver, skip: Set[str]) -> List[Tuple[str, str, str, str]]:
+    """Per-element WebDriver extraction: (name, headline, location, profile_url) per card."""
+    # all /in/ links on the page
+    links = driver.find_elements(By.XPATH, "//a[contains(@href,'/in/')]")
+    print(f"   ➕ Raw /in/ links: {len(links)}")
+
+    cards = []
+    page_seen: Set[str] = set()
+    for link in links:
+        profile_url = (link.get_attribute("href") or "").split("?", 1)[0]
+        if not profile_url or "/in/" not in profile_url:
+            continue
+        if profile_url in skip or profile_url in page_seen:
+            continue
+        page_seen.add(profile_url)
+
+        card = closest_card(link)
+
+        # Try to scrape from the card
+        name, headline, location = "", "", ""
+        if card:
+            # name
+            for sel in [
+                (By.CSS_SELECTOR, "span.entity-result__title-text a span[aria-hidden='true']"),
+                (By.XPATH, ".//span[@dir='ltr']"),
+            ]:
+                name = text_safe(card, *sel)
+                if name: break
+            # headline
+            for sel in [
+                (By.CSS_SELECTOR, "div.entity-result__primary-subtitle"),
+                (By.CSS_SELECTOR, "div.t-14.t-normal.t-black"),
+            ]:
+                headline = text_safe(card, *sel)
+                if headline: break
+            # location
+            for sel in [
+                (By.CSS_SELECTOR, "div.entity-result__secondary-subtitle"),
+                (By.CSS_SELECTOR, "div.t-12.t-normal.t-black--light"),
+                (By.CSS_SELECTOR, "span[data-anonymize='location']"),
+            ]:
+                location = text_safe(card, *sel)
+                if location: break
+
+        cards.append((name, headline, location, profile_url))
+    return cards
+
+def make_worker_driver(cookies: List[dict], args):
+    """Separate browser session for the enrichment pool, logged in with the main session's cookies."""
+    # Chrome locks a profile dir to one process, so workers get throwaway profiles
+    worker = webdriver.Chrome(options=configure_chrome(Options(), args, user_data_dir=""))
+    worker.get("https://www.linkedin.com/")
+    for cookie in cookies:
+        try:
+            worker.add_cookie(cookie)
+        except Exception:
+            continue
+    return worker
+
+def enrich_profiles(driver, pool, urls: List[str], opened: int, cache: PageCache,
+                    replay: bool = False) -> Tuple[Dict[str, Tuple[str, str, str]], int]:
+    """Top cards for the given profiles: cached pages first, then opens (bounded by MAX_PROFILE_OPENS)
+    via the pool, or serially without one. Replay never opens anything. Profiles whose top card came
+    back empty (failed open or unusable page) are left out, so they are not indexed and get retried."""
+    enriched: Dict[str, Tuple[str, str, str]] = {}
+    to_open = []
+    for u in urls:
+        cached = cache.get(u, ignore_ttl=replay)
+        if cached is not None:
+            enriched[u] = parse_profile_top_card(cached)
+        elif not replay:
+            to_open.append(u)
+    if not replay and pool is not None:
+        queued = [u for u in to_open if pool.submit(u)]
+        if queued:
+            print(f"   🧵 Enriching {len(queued)} profiles with {ENRICH_WORKERS} workers")
+            done = pool.wait()
+            enriched.update((u, done[u]) for u in queued)
+        opened = pool.opened
+    elif not replay:
+        for u in to_open:
+            if opened >= MAX_PROFILE_OPENS:
+                break
+            opened += 1
+            enriched[u] = open_profile_and_scrape(driver, u, cache)
+    failed = [u for u, card in enriched.items() if not any(card)]
+    if failed:
+        print(f"   ⚠️ {len(failed)} profiles could not be enriched; they will be retried next run")
+        metrics.incr("enrich_failures", len(failed))
+        for u in failed:
+            del enriched[u]
+    return enriched, opened
+
+def scrape_pages(driver, start_page: int, end_page: int, cache: PageCache, before_csv: CsvLeadWriter,
+                 after_csv: CsvLeadWriter, checkpoint: RunCheckpoint, pool=None, replay: bool = False,
+                 url_index=None, parquet: ParquetLeadWriter = None) -> Tuple[int, int]:
+    """Stream rows to the BEFORE/AFTER files (and every lead to `parquet`, if given) and checkpoint
+    after every page; returns the CSV row counts."""
+    run_id = checkpoint.state["run_id"]
+    # A resumed run picks up the URLs its files already hold
+    seen_all: Set[str] = read_column(before_csv.path, 2)
+    seen_after: Set[str] = read_column(after_csv.path, 2)
+    rows_before = count_rows(before_csv.path)
+    rows_after = count_rows(after_csv.path)
     opened = 0
 
     for page in range(start_page, end_page + 1):
         url = build_search_url(page)
         print(f"🔎 Page {page}: {url}")
-        driver.get(url)
-        wait_for_results(driver)
-        scroll_results(driver)
-
-        # all /in/ links on the page
-        links = driver.find_elements(By.XPATH, "//a[contains(@href,'/in/')]")
-        print(f"   ➕ Raw /in/ links: {len(links)}")
-
-        for link in links:
-            profile_url = (link.get_attribute("href") or "").split("?", 1)[0]
-            if not profile_url or "/in/" not in profile_url:
-                continue
-            if profile_url in seen_all:
+        t_page = time.perf_counter()
+
+        if OFFLINE_PARSE or replay:
+            with metrics.stage("fetch_page"):
+                # Pages without result cards (login walls, empty loads) are not cached
+                page_source = cache.fetch(url, partial(load_search_page, driver, url), replay,
+                                          valid=lambda html: bool(parse_search_cards(html)))
+            if page_source is None:
+                print("   ⏩ Not in the page cache, skipped")
+                metrics.incr("pages_skipped", reason="not_cached")
                 continue
-
-            card = closest_card(link)
-
-            # Try to scrape from the card
-            name, headline, location = "", "", ""
-            if card:
-                # name
-                for sel in [
-                    (By.CSS_SELECTOR, "span.entity-result__title-text a span[aria-hidden='true']"),
-                    (By.XPATH, ".//span[@dir='ltr']"),
-                ]:
-                    name = text_safe(card, *sel)
-                    if name: break
-                # headline
-                for sel in [
-                    (By.CSS_SELECTOR, "div.entity-result__primary-subtitle"),
-                    (By.CSS_SELECTOR, "div.t-14.t-normal.t-black"),
-                ]:
-                    headline = text_safe(card, *sel)
-                    if headline: break
-                # location
-                for sel in [
-                    (By.CSS_SELECTOR, "div.entity-result__secondary-subtitle"),
-                    (By.CSS_SELECTOR, "div.t-12.t-normal.t-black--light"),
-                    (By.CSS_SELECTOR, "span[data-anonymize='location']"),
-                ]:
-                    location = text_safe(card, *sel)
-                    if location: break
-
-            # If missing key bits, open profile (bounded)
-            if (not location or not headline) and opened < MAX_PROFILE_OPENS:
-                opened += 1
-                pn, ph, pl = open_profile_and_scrape(driver, profile_url)
+            with metrics.stage("parse_cards"):
+                cards = parse_search_cards(page_source)
+        else:
+            load_search_page(driver, url)
+            with metrics.stage("parse_cards"):
+                cards = extract_cards_selenium(driver, seen_all)
+        print(f"   ➕ Profile cards: {len(cards)}")
+        metrics.incr("cards_seen", len(cards))
+        for field, i in (("name", 0), ("headline", 1), ("location", 2)):
+            metrics.incr("selector_misses", sum(1 for c in cards if not c[i]), field=field)
+
+        cards = [c for c in cards if c[3] not in seen_all]
+        if url_index is not None:
+            fresh = [c for c in cards if c[3] not in url_index]
+            if len(fresh) < len(cards):
+                print(f"   ⏩ {len(cards) - len(fresh)} profiles already handled in earlier runs")
+                metrics.incr("profiles_skipped", len(cards) - len(fresh), reason="url_index")
+            cards = fresh
+
+        # If missing key bits, open profile (bounded)
+        needs_open = [c[3] for c in cards if not c[2] or not c[1]]
+        opened_before = opened
+        with metrics.stage("enrich_profiles"):
+            enriched, opened = enrich_profiles(driver, pool, needs_open, opened, cache, replay)
+        metrics.incr("profiles_opened", opened - opened_before)
+        metrics.observe("profiles_opened_per_page", opened - opened_before, COUNT_BUCKETS)
+        # Profiles left unopened by the MAX_PROFILE_OPENS budget stay out of the index for a later run
+        skipped = set(needs_open).difference(enriched)
+        handled_urls = [c[3] for c in cards if c[3] not in skipped]
+
+        for name, headline, location, profile_url in cards:
+            if profile_url in enriched:
+                pn, ph, pl = enriched[profile_url]
                 name = pn or name
                 headline = ph or headline
                 location = pl or location
 
+            if not location_is_us_not_ny(location):
+                reject = "location"
+            elif not headline_or_name_has_kw(headline, name):
+                reject = "keyword"
+            else:
+                reject = None
+            lead = LeadRecord(SOURCE, run_id, profile_url, name, headline, location, qualified=reject is None,
+                              scraped_at=utc_now())
+
+            # Filtered row first: the BEFORE row is what marks the URL as done on resume
+            if reject is not None:
+                metrics.incr("filter_rejects", reason=reject)
+            elif profile_url in seen_after:
+                metrics.incr("filter_rejects", reason="duplicate")
+            else:
+                after_csv.append(lead)
+                rows_after += 1
+                seen_after.add(profile_url)
+                metrics.incr("leads_saved")
+
             # Add to BEFORE CSV (raw capture)
-            rows_before.append([name, headline, profile_url, headline, location])
+            before_csv.append(lead)
+            if parquet is not None:
+                parquet.append(lead)
+            rows_before += 1
             seen_all.add(profile_url)
 
-            # Apply filters for AFTER CSV
-            if not location_is_us_not_ny(location):
-                continue
-            if not headline_or_name_has_kw(headline, name):
-                continue
-
-            if profile_url not in seen_after:
-                rows_after.append([name, headline, profile_url, headline, location])
-                seen_after.add(profile_url)
+        with metrics.stage("csv_write"):
+            before_csv.flush()  # flushes after_csv first
+            checkpoint.save(last_page=page, rows_before=rows_before, rows_after=rows_after)
+        # Only URLs whose rows are on disk are marked as handled for later runs
+        if url_index is not None:
+            url_index.add_many(handled_urls)
+        metrics.observe("page_seconds", time.perf_counter() - t_page)
 
     return rows_before, rows_after
 
 def main():
-    start_page = int(input("Enter start page (e.g., 1): ").strip())
-    end_page   = int(input("Enter end page (e.g., 5): ").strip())
-
-    options = Options()
-    options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(options=options)  # Selenium Manager fetches driver automatically
-
-    login_to_linkedin(driver)
-    rows_before, rows_after = scrape_pages(driver, start_page, end_page)
-
-    # Save BEFORE (raw) CSV
-    with open(CSV_BEFORE, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Name", "Headline", "LinkedIn URL", "Company/Title", "Location"])
-        writer.writerows(rows_before)
-
-    # Save AFTER (filtered) CSV
-    with open(CSV_AFTER, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Name", "Headline", "LinkedIn URL", "Company/Title", "Location"])
-        writer.writerows(rows_after)
-
-    print(f"\n✅ BEFORE CSV: {CSV_BEFORE} ({len(rows_before)} rows)")
-    print(f"✅ AFTER  CSV: {CSV_AFTER}  ({len(rows_after)} rows)")
-    input("Press Enter to close the browser...")
-    driver.quit()
+    parser = argparse.ArgumentParser(description="Scrape LinkedIn people search for KEYWORD in the US.")
+    parser.add_argument("--replay", action="store_true",
+                        help=f"re-run parsing and filters from {PAGE_CACHE_PATH} only (no browser)")
+    parser.add_argument("--no-index", action="store_true",
+                        help=f"ignore {URL_INDEX_PATH} and revisit profiles from earlier runs")
+    parser.add_argument("--run-id", help="names this run's output files and checkpoint (default: a timestamp)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue a run after its last completed page (the latest run unless --run-id is given)")
+    add_common_args(parser)
+    args = parse_args(parser)
+
+    if args.resume:
+        run_id = args.run_id or latest_run_id()
+        checkpoint = RunCheckpoint(output_paths(run_id)[2]) if run_id else None
+        if checkpoint is None or not checkpoint.state:
+            parser.error(f"no checkpoint to resume{f' for run {run_id}' if run_id else ''}")
+        start_page = checkpoint.state["last_page"] + 1
+        end_page = checkpoint.state["end_page"]
+        args.replay = args.replay or checkpoint.state.get("replay", False)
+        print(f"↩️ Resuming run {run_id} at page {start_page} of {checkpoint.state['start_page']}-{end_page}")
+        if start_page > end_page:
+            print("✅ Run already complete.")
+            return
+    else:
+        run_id = args.run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        checkpoint = RunCheckpoint(output_paths(run_id)[2])
+        if checkpoint.state:
+            parser.error(f"run {run_id} already exists; use --resume or another --run-id")
+        start_page, end_page = page_range(args, parser)
+        checkpoint.save(run_id=run_id, start_page=start_page, end_page=end_page, last_page=start_page - 1,
+                        replay=args.replay)
+    metrics.run_id = run_id
+    csv_before, csv_after, _ = output_paths(run_id)
+    after_csv = CsvLeadWriter(csv_after, SOURCE, FLUSH_EVERY)
+    before_csv = CsvLeadWriter(csv_before, SOURCE, FLUSH_EVERY, flush_first=[after_csv])
+    parquet = ParquetLeadWriter(args.parquet_dir) if args.parquet_dir else None
+
+    cache = PageCache(PAGE_CACHE_PATH, PAGE_CACHE_TTL_HOURS)
+    # Replay re-filters everything in the cache, so it never consults the index
+    url_index = None if args.replay or args.no_index else UrlIndex(URL_INDEX_PATH, "customer_service")
+    driver = None
+    pool = None
+    if not args.replay:
+        # Selenium Manager fetches driver automatically
+        driver = webdriver.Chrome(options=configure_chrome(Options(), args))
+
+        with metrics.stage("login"):
+            login_to_linkedin(driver, args)
+        if ENRICH_WORKERS > 0:
+            factory = partial(make_worker_driver, driver.get_cookies(), args)
+            pool = ProfileEnrichmentPool(factory, ENRICH_WORKERS, MAX_PROFILE_OPENS, PROFILE_OPEN_INTERVAL_SEC,
+                                         page_sink=cache.put)
+    t0 = time.perf_counter()
+    try:
+        rows_before, rows_after = scrape_pages(driver, start_page, end_page, cache, before_csv, after_csv,
+                                               checkpoint, pool, args.replay, url_index, parquet)
+    finally:
+        before_csv.close()
+        after_csv.close()
+        if parquet is not None:
+            parquet.close()
+        if url_index is not None:
+            url_index.close()
+        if pool is not None:
+            pool.close()
+        cache.close()
+        metrics.incr("page_cache", cache.hits, result="hit")
+        metrics.incr("page_cache", cache.misses, result="miss")
+        metrics.incr("page_cache", cache.rejected, result="rejected")
+        metrics.finish(args.metrics_dir, args.prom_textfile)
+
+    print(f"\n✅ BEFORE CSV: {csv_before} ({rows_before} rows)")
+    print(f"✅ AFTER  CSV: {csv_after}  ({rows_after} rows)")
+    print(f"⏱ {time.perf_counter() - t0:.1f}s, page cache hits {cache.hits} / misses {cache.misses}")
+    close_browser(driver, args)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,84 @@
+import os
+import re
+import json
+import time
+from typing import Iterable, Optional
+
+# activity_check.py
+# Recency parsing for LinkedIn "recent activity" timestamps ("5h", "3d", "2w",
+# "1mo", "1yr", "3 weeks ago", ...) and a small JSON cache of the newest post
+# age per profile, so re-runs skip activity pages checked within the TTL.
+
+ACTIVITY_CACHE_PATH = "activity_cache.json"
+TTL_HOURS = 24
+
+# Longest alternatives first so "mo" is not read as minutes and "min" not as months
+RECENCY_RE = re.compile(
+    r"\b(\d+)\s*(months?|mos?|years?|yrs?|y|weeks?|wks?|w|days?|d|hours?|hrs?|h|minutes?|mins?|m|seconds?|secs?|s)\b",
+    re.IGNORECASE,
+)
+UNIT_DAYS = {"mo": 30, "y": 365, "w": 7, "d": 1, "h": 0, "m": 0, "s": 0}
+
+
+def _unit_key(unit: str) -> str:
+    unit = unit.lower()
+    if unit.startswith("mo"):
+        return "mo"
+    if unit.startswith("mi"):
+        return "m"
+    return unit[0]
+
+
+def activity_age_days(text: str) -> Optional[float]:
+    """Age in days of one timestamp ("2w" -> 14, "5h" -> 0); None when it has no relative time."""
+    match = RECENCY_RE.search(text or "")
+    if not match:
+        return None
+    return int(match.group(1)) * UNIT_DAYS[_unit_key(match.group(2))]
+
+
+def newest_activity_age(stamps: Iterable[str]) -> Optional[float]:
+    """Smallest age among the timestamps on an activity page; None when there are no posts."""
+    ages = [a for a in map(activity_age_days, stamps) if a is not None]
+    return min(ages) if ages else None
+
+
+class ActivityCache:
+    """url -> (newest post age in days, checked_at). Verdicts are derived at lookup time,
+    so a cached age stays valid when RECENT_DAYS changes."""
+
+    def __init__(self, path: str = ACTIVITY_CACHE_PATH, ttl_hours: float = TTL_HOURS):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.entries = {}
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def is_recent(self, url: str, days: float) -> Optional[bool]:
+        """Cached verdict for `url`, or None when unknown or older than the TTL."""
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        age, checked_at = entry
+        elapsed = time.time() - checked_at
+        if elapsed > self.ttl:
+            return None
+        return age is not None and age + elapsed / 86400 <= days
+
+    def record(self, url: str, newest_age: Optional[float]):
+        self.entries[url] = [newest_age, time.time()]
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
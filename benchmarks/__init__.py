@@ -0,0 +1,4 @@
+# Offline benchmarks; run from the repo root, e.g. `python -m benchmarks.bench_batch_encoding`.
+# `python -m benchmarks` runs the regression suite against benchmarks/baseline.json (suite.py).
+# No baseline is committed (throughput is machine-specific): record one with --save-baseline,
+# and pass --require-baseline in CI so a missing one fails instead of only reporting.
@@ -0,0 +1,7 @@
+import sys
+
+from benchmarks.suite import main
+
+# `python -m benchmarks`: the regression suite (see suite.py for options)
+
+sys.exit(main())
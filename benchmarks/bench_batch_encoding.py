@@ -0,0 +1,48 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from loan_features import CATEGORICAL_COLUMNS, FLAG_COLUMNS, NUMERIC_COLUMNS, build_pipeline, prepare_frame
+from benchmarks.common import synthetic_upload, synthetic_training, legacy_encode_frame
+from sklearn.dummy import DummyClassifier
+
+# Batch-upload encoding: the row-wise normalize_row loop vs prepare_frame + the
+# pipeline's encoder. Checks both yield identical features before timing anything.
+
+
+def fitted_features():
+    train = synthetic_training(500)
+    pipe = build_pipeline(DummyClassifier())
+    pipe.fit(prepare_frame(train), train["Loan_Status"])
+    return pipe.named_steps["features"]
+
+
+def check_parity(features, df: pd.DataFrame):
+    # The pipeline emits categorical, flag, then numeric columns
+    expected = legacy_encode_frame(df)[CATEGORICAL_COLUMNS + FLAG_COLUMNS + NUMERIC_COLUMNS]
+    actual = features.transform(prepare_frame(df))
+    np.testing.assert_array_equal(actual, expected.to_numpy(dtype=float))
+
+
+def main(sizes):
+    features = fitted_features()
+    check_parity(features, synthetic_upload(2000))
+    codes = legacy_encode_frame(synthetic_upload(2000, seed=1))
+    check_parity(features, codes)  # already-numeric uploads are mapped back to labels
+    print("✅ pipeline features match normalize_row")
+
+    for n in sizes:
+        df = synthetic_upload(n)
+        t0 = time.perf_counter()
+        legacy_encode_frame(df)
+        rowwise = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        features.transform(prepare_frame(df))
+        vectorized = time.perf_counter() - t0
+        print(f"{n:>8} rows | row-wise {rowwise:8.3f}s | column-wise {vectorized:8.4f}s | {rowwise / vectorized:6.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
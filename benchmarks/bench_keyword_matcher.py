@@ -0,0 +1,52 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import KeywordMatcher
+
+# Headline keyword filter: the old lower()-per-keyword loop vs one compiled
+# KeywordMatcher, with keyword lists growing toward hundreds of titles.
+
+SENIORITY = ["Senior", "Lead", "Junior", "Chief", "Associate", "Principal", "Regional", "Assistant"]
+ROLES = ["Advisor", "Agent", "Officer", "Consultant", "Manager", "Specialist", "Representative",
+         "Coordinator", "Analyst", "Director", "Teacher", "Broker", "Planner", "Underwriter"]
+FIELDS = ["Sales", "Insurance", "Mortgage", "Loan", "Financial", "Customer Service", "Real Estate",
+          "Benefits", "Retirement", "Wealth", "Claims", "Credit", "Tax", "Investment"]
+
+
+def keyword_list(n: int):
+    titles = [f"{f} {r}" for f in FIELDS for r in ROLES] + [f"{s} {f} {r}" for s in SENIORITY for f in FIELDS for r in ROLES]
+    return titles[:n]
+
+
+def headlines(n: int, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    words = SENIORITY + ROLES + FIELDS + ["at", "Acme", "Corp", "|", "helping", "families", "grow", "Nurse"]
+    return pd.Series([" ".join(rng.choice(words, rng.integers(4, 12))) for _ in range(n)])
+
+
+def loop_filter(texts, keywords):
+    return [any(kw.lower() in (t or "").lower() for kw in keywords) for t in texts]
+
+
+def main(sizes):
+    texts = headlines(20_000)
+    for n in sizes:
+        keywords = keyword_list(n)
+        t0 = time.perf_counter()
+        old = loop_filter(texts, keywords)
+        looped = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        compiled = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        new = matcher.classify(texts)
+        matched = time.perf_counter() - t0
+        print(f"{n:>5} keywords | loop {looped:7.3f}s ({sum(old)} hits) | compile {compiled:6.3f}s "
+              f"| matcher {matched:7.3f}s ({int(new.sum())} hits) | {looped / matched:6.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [11, 100, 500, 1500])
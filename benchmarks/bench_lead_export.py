@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from lead_record import LeadRecord, CsvLeadWriter, ParquetLeadWriter, utc_now
+from benchmarks.suite import LOCATIONS, HEADLINES
+
+# Lead archive size and load time: the customer_service CSV layout vs the
+# dictionary-encoded Parquet export of the same LeadRecords.
+#   python -m benchmarks.bench_lead_export 2000000
+
+
+def leads(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    loc = rng.integers(0, len(LOCATIONS), n)
+    head = rng.integers(0, len(HEADLINES), n)
+    now = utc_now()
+    for i in range(n):
+        yield LeadRecord("customer_service", "bench", f"https://www.linkedin.com/in/member-{i:x}",
+                         f"Member {i}", HEADLINES[head[i]], LOCATIONS[loc[i]], qualified=bool(i % 3),
+                         scraped_at=now)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main(n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "leads.csv")
+        pq_dir = os.path.join(tmp, "leads_parquet")
+        with CsvLeadWriter(csv_path, "customer_service", flush_every=100_000) as writer:
+            _, csv_write = timed(lambda: [writer.append(r) for r in leads(n)])
+        with ParquetLeadWriter(pq_dir) as writer:
+            _, pq_write = timed(lambda: writer.extend(leads(n)))
+
+        csv_mb = os.path.getsize(csv_path) / 1e6
+        pq_mb = sum(os.path.getsize(os.path.join(pq_dir, f)) for f in os.listdir(pq_dir)) / 1e6
+        csv_df, csv_load = timed(lambda: pd.read_csv(csv_path))
+        pq_df, pq_load = timed(lambda: pd.read_parquet(pq_dir))
+        assert len(csv_df) == len(pq_df) == n
+        assert (csv_df["Location"].fillna("") == pq_df["location"].astype(str)).all()
+
+        csv_mem = csv_df.memory_usage(deep=True).sum() / 1e6
+        pq_mem = pq_df.memory_usage(deep=True).sum() / 1e6
+        print(f"{n:,} leads")
+        print(f"CSV     | write {csv_write:6.2f}s | file {csv_mb:8.1f} MB | load {csv_load:6.2f}s | in memory {csv_mem:8.1f} MB")
+        print(f"Parquet | write {pq_write:6.2f}s | file {pq_mb:8.1f} MB | load {pq_load:6.2f}s | in memory {pq_mem:8.1f} MB")
+        print(f"size {csv_mb / pq_mb:.1f}x smaller, load {csv_load / pq_load:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,56 @@
+import re
+import sys
+import time
+
+import pandas as pd
+
+from location_rules import US_NOT_NY, US_MARKERS, US_STATE_ABBR, US_STATE_FULL, US_CITIES, EXCLUDE_TERMS, \
+    classify_locations
+from location_rules import _alternation
+from benchmarks.suite import LOCATIONS, corpus
+
+# Batch location filter: one DOTALL pattern with a ".*" lookahead run through
+# Series.str.contains on every row (the previous classifier) vs
+# classify_locations (distinct values only, split include/exclude searches).
+#   python -m benchmarks.bench_location_rules 1000000
+
+
+def single_pattern() -> re.Pattern:
+    us_terms = US_MARKERS + sorted(US_STATE_FULL) + sorted(US_CITIES)
+    abbr = _alternation(a.lower() for a in US_STATE_ABBR if a.lower() not in EXCLUDE_TERMS)
+    return re.compile(
+        rf"^(?!.*(?<![a-z])(?:{_alternation(EXCLUDE_TERMS)})(?![a-z]))"
+        rf"(?:.*(?<![a-z])(?:{_alternation(us_terms)})(?![a-z])|.*,\s*(?:{abbr})\s*$)",
+        re.DOTALL,
+    )
+
+
+def corpora(n: int):
+    long = [f"Helping families and small businesses across {loc} and the surrounding region" for loc in LOCATIONS]
+    yield "mixed", pd.Series(corpus(LOCATIONS, n))
+    yield "long strings", pd.Series(corpus(long, n, seed=1))
+    yield "one value", pd.Series(["Austin, Texas, United States"] * n)
+    yield "all distinct", pd.Series([f"{loc} {i}" for i, loc in enumerate(corpus(LOCATIONS, n, seed=2))])
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main(n: int):
+    pattern = single_pattern()
+    for label, series in corpora(n):
+        old, old_sec = timed(lambda: series.fillna("").astype(str).str.lower().str.contains(pattern, regex=True))
+        new, new_sec = timed(lambda: classify_locations(series))
+        assert (old == new).all()
+        print(f"{label:<13} | single pattern {n / old_sec:>12,.0f} rows/sec | classify_locations "
+              f"{n / new_sec:>12,.0f} rows/sec | {old_sec / new_sec:6.1f}x")
+    one = "Austin, Texas, United States"
+    _, sec = timed(lambda: [US_NOT_NY(one) for _ in range(n)])
+    print(f"scalar is_us_location: {n / sec:,.0f} calls/sec")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
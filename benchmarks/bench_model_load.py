@@ -0,0 +1,88 @@
+import multiprocessing as mp
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from flat_forest import FlatForestModel, export_flat
+from loan_features import build_pipeline, prepare_frame
+from benchmarks.common import synthetic_training, synthetic_upload
+
+# Cold-start cost per worker: unpickling loan_model.pkl vs mmap-loading the flat
+# export. Starts several worker processes at once and reports load time, RSS and
+# PSS (RSS with shared pages split between the processes that map them).
+
+
+def memory_kb():
+    """(rss, pss) of this process in kB, from /proc (Linux)."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts and parts[0] in ("Rss:", "Pss:"):
+                fields[parts[0]] = int(parts[1])
+    return fields.get("Rss:", 0), fields.get("Pss:", 0)
+
+
+def worker(kind, path, sample, ready, release):
+    t0 = time.perf_counter()
+    if kind == "pickle":
+        with open(path, "rb") as f:
+            model = pickle.load(f)
+    else:
+        model = FlatForestModel.load(path)
+    load_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    model.predict(sample)  # touch the trees like a first request would
+    predict_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    model.predict(sample[:1])
+    single_s = time.perf_counter() - t0
+    ready.put((load_s, predict_s, single_s) + memory_kb())
+    release.wait()
+
+
+def run(kind, path, sample, workers):
+    ctx = mp.get_context("spawn")
+    ready, release = ctx.Queue(), ctx.Event()
+    procs = [ctx.Process(target=worker, args=(kind, path, sample, ready, release)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    stats = [ready.get() for _ in procs]
+    release.set()
+    for p in procs:
+        p.join()
+    return stats
+
+
+def main(workers: int, trees: int):
+    train = synthetic_training(20_000)
+    pipeline = build_pipeline(RandomForestClassifier(n_estimators=trees, random_state=42, n_jobs=-1))
+    pipeline.fit(prepare_frame(train), (train["Loan_Status"] == "Y").astype(int))
+    sample = prepare_frame(synthetic_upload(2_000, seed=3))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pkl = os.path.join(tmp, "loan_model.pkl")
+        with open(pkl, "wb") as f:
+            pickle.dump(pipeline, f)
+        flat = os.path.join(tmp, "loan_model_flat")
+        export_flat(pipeline, flat)
+
+        same = np.array_equal(FlatForestModel.load(flat).predict(sample), pipeline.predict(sample))
+        print(f"{'✅' if same else '❌'} flat predictions match the pipeline ({trees} trees)")
+
+        for kind, path in [("pickle", pkl), ("flat", flat)]:
+            stats = np.array(run(kind, path, sample, workers))
+            load_s, predict_s, single_s, rss, pss = stats.mean(axis=0)
+            print(f"{kind:>7} | {workers} workers | load {load_s * 1000:7.1f} ms"
+                  f" | first {len(sample)}-row predict {predict_s * 1000:7.1f} ms | 1-row predict {single_s * 1000:6.1f} ms"
+                  f" | RSS {rss / 1024:7.1f} MB | PSS {pss / 1024:7.1f} MB per worker")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 4, args[1] if len(args) > 1 else 100)
@@ -0,0 +1,45 @@
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from loan_features import build_pipeline, encode_inputs, prepare_frame
+from benchmarks.common import APPLICANT, synthetic_training, synthetic_upload, legacy_encode_inputs, legacy_encode_frame
+
+# Serving latency before/after the pipeline artifact: hand-encoded DataFrame into
+# a bare forest vs raw rows into the fitted Pipeline. Same data, same forest size.
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of `repeat` calls, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return float(np.median(samples)) * 1000
+
+
+def main():
+    train = synthetic_training(5000)
+    y = (train["Loan_Status"] == "Y").astype(int)
+
+    legacy = RandomForestClassifier(n_estimators=100, random_state=42)
+    legacy.fit(legacy_encode_frame(train.assign(Credit_History=train["Credit_History"].astype(int))), y)
+    pipeline = build_pipeline(RandomForestClassifier(n_estimators=100, random_state=42))
+    pipeline.fit(prepare_frame(train), y)
+
+    batch = synthetic_upload(10_000, seed=7)
+    rows = {
+        "single row": (lambda: legacy.predict(legacy_encode_inputs(APPLICANT)),
+                       lambda: pipeline.predict(encode_inputs(APPLICANT)), 50),
+        "10k rows": (lambda: legacy.predict(legacy_encode_frame(batch)),
+                     lambda: pipeline.predict(prepare_frame(batch)), 5),
+    }
+    for label, (before, after, repeat) in rows.items():
+        b, a = timed(before, repeat), timed(after, repeat)
+        print(f"{label:>10} | before {b:9.2f} ms | after {a:9.2f} ms | {b / a:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
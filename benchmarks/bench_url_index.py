@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import resource
+import tempfile
+
+import numpy as np
+
+from url_index import UrlIndex
+
+# Cross-run URL index at scale: bulk load N profile URLs, then time single
+# lookups (hits and misses) the way the scrapers issue them, one per card.
+#   python -m benchmarks.bench_url_index 10000000
+
+BATCH = 100_000
+LOOKUPS = 20_000
+
+
+def url(i: int) -> str:
+    return f"https://www.linkedin.com/in/member-{i:x}-{i % 97}?trk=search"
+
+
+def main(n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "url_index.sqlite")
+        index = UrlIndex(path, "bench")
+        t0 = time.perf_counter()
+        for start in range(0, n, BATCH):
+            index.add_many(url(i) for i in range(start, min(start + BATCH, n)))
+        load = time.perf_counter() - t0
+
+        rng = np.random.default_rng(0)
+        probes = [url(int(i)) for i in rng.integers(0, n, LOOKUPS // 2)] + \
+                 [url(int(i)) for i in rng.integers(n, 2 * n, LOOKUPS // 2)]
+        timings = np.empty(len(probes))
+        hits = 0
+        for k, u in enumerate(probes):
+            t = time.perf_counter()
+            hits += u in index
+            timings[k] = time.perf_counter() - t
+        index.close()
+
+        size_mb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 1e6
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"{n:,} URLs loaded in {load:.1f}s | file {size_mb:.0f} MB | peak RSS {rss_mb:.0f} MB")
+        print(f"lookups: {hits} hits / {len(probes)} | p50 {np.percentile(timings, 50) * 1e6:.1f} µs"
+              f" | p99 {np.percentile(timings, 99) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,51 @@
+import glob
+import sys
+import time
+
+from search_parser import parse_open_to_work_cards
+from debug_capture import read_page
+from benchmarks.common import synthetic_search_page, legacy_scan_cards
+
+# wfg open-to-work card scan: BeautifulSoup + list dedupe + str(card) vs the
+# single-pass lxml extractor. Runs over saved pages when given, e.g.
+#   python -m benchmarks.bench_wfg_cards "debug_pages/*.html.gz"
+# otherwise over synthetic result pages of increasing size.
+
+REPEATS = 5
+
+
+def pages_per_sec(fn, pages) -> float:
+    t0 = time.perf_counter()
+    for _ in range(REPEATS):
+        for page in pages:
+            fn(page)
+    return REPEATS * len(pages) / (time.perf_counter() - t0)
+
+
+def check_parity(pages):
+    for i, page in enumerate(pages):
+        new, _ = parse_open_to_work_cards(page)
+        assert new == legacy_scan_cards(page), f"page {i}: extractors disagree"
+
+
+def report(label: str, pages):
+    check_parity(pages)
+    before = pages_per_sec(legacy_scan_cards, pages)
+    after = pages_per_sec(lambda p: parse_open_to_work_cards(p), pages)
+    print(f"{label:<24} | before {before:8.1f} pages/sec | after {after:8.1f} pages/sec | {after / before:5.1f}x")
+
+
+def main(paths):
+    files = []
+    for p in paths:
+        files.extend(sorted(glob.glob(p)))
+    if files:
+        pages = [read_page(path) for path in files]
+        report(f"{len(pages)} saved pages", pages)
+        return
+    for n_cards in [10, 50, 200]:
+        report(f"{n_cards} cards/page", [synthetic_search_page(n_cards, seed) for seed in range(10)])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
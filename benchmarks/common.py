@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from loan_features import GOOD_CREDIT, MAPPING, FEATURE_COLUMNS
+
+# Synthetic inputs and the pre-pipeline ("legacy") encoders the benchmarks compare against.
+
+APPLICANT = {
+    "Gender": "Male", "Married": "Yes", "Dependents": "0", "Education": "Graduate",
+    "Self_Employed": "No", "ApplicantIncome": 5000, "CoapplicantIncome": 0, "LoanAmount": 150,
+    "Loan_Amount_Term": 360, "Credit_History": "Good (1)", "Property_Area": "Urban",
+}
+
+
+def synthetic_upload(n: int, seed: int = 0) -> pd.DataFrame:
+    """Applicants CSV as users upload it (labels, mixed Credit_History spellings)."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Gender": rng.choice(["Male", "Female"], n),
+        "Married": rng.choice(["Yes", "No"], n),
+        "Dependents": rng.choice(["0", "1", "2", "3+"], n),
+        "Education": rng.choice(["Graduate", "Not Graduate"], n),
+        "Self_Employed": rng.choice(["No", "Yes"], n),
+        "ApplicantIncome": rng.integers(0, 20000, n),
+        "CoapplicantIncome": rng.integers(0, 8000, n),
+        "LoanAmount": rng.integers(10, 600, n),
+        "Loan_Amount_Term": rng.choice([12, 36, 60, 84, 120, 180, 240, 300, 360], n),
+        "Credit_History": rng.choice(["Good (1)", "Bad (0)", "1", "0", " good"], n),
+        "Property_Area": rng.choice(["Urban", "Semiurban", "Rural"], n),
+    })
+
+
+def synthetic_training(n: int, seed: int = 0) -> pd.DataFrame:
+    """loan_dataset.csv-shaped frame with a learnable Loan_Status."""
+    df = synthetic_upload(n, seed)
+    rng = np.random.default_rng(seed + 1)
+    df["Credit_History"] = rng.choice([1.0, 0.0], n, p=[0.85, 0.15])
+    score = (df["Credit_History"] * 2 + (df["ApplicantIncome"] + df["CoapplicantIncome"]) / 10000
+             - df["LoanAmount"] / 400 + rng.normal(0, 0.5, n))
+    df["Loan_Status"] = np.where(score > 1.2, "Y", "N")
+    return df
+
+
+def legacy_encode_inputs(form_data: dict) -> pd.DataFrame:
+    """Hand-mapped single row, as the app encoded the form before the pipeline artifact."""
+    row = {k: MAPPING[k][form_data[k]] if k in MAPPING else form_data[k] for k in FEATURE_COLUMNS}
+    row["Credit_History"] = 1 if form_data["Credit_History"] == "Good (1)" else 0
+    return pd.DataFrame([row])
+
+
+def normalize_row(r) -> dict:
+    """Row-wise batch encoder the app used before encode_frame/prepare_frame."""
+    out = {}
+    for k in FEATURE_COLUMNS:
+        v = r[k]
+        if k in MAPPING:
+            if isinstance(v, str) and v in MAPPING[k]:
+                out[k] = MAPPING[k][v]
+            else:
+                out[k] = int(v)
+        elif k == "Credit_History":
+            if isinstance(v, str):
+                out[k] = 1 if v.strip() in GOOD_CREDIT else 0
+            else:
+                out[k] = int(v)
+        else:
+            out[k] = v
+    return out
+
+
+def legacy_encode_frame(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame([normalize_row(r) for _, r in df.iterrows()])
+
+
+def synthetic_search_page(n_cards: int = 10, seed: int = 0) -> str:
+    """People-search results page shaped like a saved debug_page_*.html (chrome, cards, some badges)."""
+    rng = np.random.default_rng(seed)
+    chrome = "".join(f'<li class="global-nav__item"><a href="/feed/?nav={i}"><span>Nav {i}</span></a></li>'
+                     for i in range(40))
+    cards = []
+    for i in range(n_cards):
+        slug = f"member-{seed}-{i}"
+        badge = ('<img alt="Open to work" class="pv-member-badge--opentowork">'
+                 if rng.random() < 0.3 else '<img alt="" class="presence-entity__image">')
+        cards.append(
+            f'<li class="reusable-search__result-container"><div class="entity-result">'
+            f'<a class="app-aware-link" href="https://www.linkedin.com/in/{slug}?miniProfileUrn=urn%3Ali%3A{i}">{badge}</a>'
+            f'<span class="entity-result__title-text"><a href="https://www.linkedin.com/in/{slug}?trk=x">'
+            f'<span aria-hidden="true">Member {i}</span></a></span>'
+            f'<div class="entity-result__primary-subtitle">Financial Professional {i}</div>'
+            f'<div class="entity-result__secondary-subtitle">Austin, TX</div>'
+            f'<ul>{"".join(f"<li><span>insight {k}</span></li>" for k in range(3))}</ul>'
+            f'</div></li>'
+        )
+    return (f'<html><head><script>{"var x=1;" * 500}</script></head><body><nav><ul>{chrome}</ul></nav>'
+            f'<main><ul class="reusable-search__entity-result-list">{"".join(cards)}</ul></main></body></html>')
+
+
+def legacy_scan_cards(page_source: str):
+    """wfg scan_search_page before the lxml extractor: BeautifulSoup, list membership, str(card) badge check."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_source, "lxml")
+    cards = []
+    for link in soup.find_all("a", href=True):
+        if "/in/" in link["href"]:
+            parent_li = link.find_parent("li")
+            if parent_li and parent_li not in cards:
+                cards.append(parent_li)
+
+    found = []
+    urls = []
+    for card in cards:
+        link = card.find("a", href=True)
+        if not link or "/in/" not in link["href"]:
+            continue
+        url = link["href"].split("?")[0]
+        if url in urls:
+            continue
+        card_html = str(card).lower()
+        urls.append(url)
+        found.append((url, "open to work" in card_html or "opentowork" in card_html))
+    return found
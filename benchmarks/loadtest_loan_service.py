@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+from benchmarks.common import APPLICANT
+
+# Load test for a running loan_service.py: N keep-alive clients each send
+# single-applicant /predict requests back to back; reports latency percentiles
+# and throughput per concurrency level.
+#
+#   python loan_service.py &
+#   python -m benchmarks.loadtest_loan_service --url http://127.0.0.1:8000
+
+
+async def client(host: str, port: int, body: bytes, deadline: float, latencies: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = (f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+    try:
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+async def run_level(host: str, port: int, concurrency: int, seconds: float):
+    body = json.dumps({"applicants": [APPLICANT]}).encode("utf-8")
+    latencies: list = []
+    deadline = time.perf_counter() + seconds
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(host, port, body, deadline, latencies) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    ms = np.array(latencies) * 1000
+    print(f"{concurrency:>5} clients | {len(ms):>7} req | {len(ms) / elapsed:8.1f} req/s"
+          f" | p50 {np.percentile(ms, 50):7.2f} ms | p99 {np.percentile(ms, 99):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency/throughput load test for loan_service.py")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    args = parser.parse_args()
+    url = urlparse(args.url)
+    for c in args.concurrency:
+        asyncio.run(run_level(url.hostname, url.port or 80, c, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
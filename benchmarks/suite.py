@@ -0,0 +1,308 @@
+import glob
+import json
+import os
+import pickle
+import platform
+import sys
+import time
+import argparse
+import shutil
+import tempfile
+import tracemalloc
+from functools import cache, partial
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from search_parser import parse_search_cards, parse_open_to_work_cards
+from location_rules import is_us_location, classify_locations
+from loan_features import encode_inputs, prepare_frame, build_pipeline, sweep_inputs, approval_probability
+from flat_forest import FlatForestModel, export_flat
+from debug_capture import read_page
+from benchmarks.common import APPLICANT, synthetic_upload, synthetic_training, synthetic_search_page, normalize_row
+
+# Offline regression suite for the scraper and loan hot paths. Every component is
+# timed on synthetic fixtures (plus saved pages with --pages), reporting
+# throughput and tracemalloc peak memory, and compared with a saved baseline:
+#
+#   python -m benchmarks --save-baseline            # record benchmarks/baseline.json
+#   python -m benchmarks                            # exit 1 if a component regressed
+#   python -m benchmarks --require-baseline         # CI: also exit 2 when there is no baseline
+#   python -m benchmarks --scale full -k location   # corpora up to 10^7 rows
+#   python -m benchmarks --pages "debug_pages/*.html.gz"
+#
+# Throughput is only comparable on the machine that recorded the baseline, so
+# none is committed: without one a run only reports and says so.
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+MAX_SLOWDOWN = 0.20      # fail when items/sec drops more than 20% below baseline
+MAX_MEMORY_GROWTH = 0.25  # fail when peak memory grows more than 25% over baseline
+MIN_TIME_SEC = 0.2       # each measurement repeats the call until it has run this long
+ROUNDS = 3               # best of N measurements
+
+SIZES = {
+    "quick": {"pages": [20], "rows": [1_000, 100_000], "applicants": [1_000]},
+    "full": {"pages": [20, 200], "rows": [1_000, 100_000, 1_000_000, 10_000_000], "applicants": [1_000, 100_000]},
+}
+# Pure-Python per-row loops stop here; the vectorized paths take the full range
+LOOP_MAX_ROWS = 1_000_000
+
+LOCATIONS = [
+    "Austin, TX", "Austin, Texas, United States", "San Francisco Bay Area", "Los Angeles, California",
+    "New York, NY", "Brooklyn, New York, United States", "New York City Metropolitan Area", "Chicago, IL",
+    "Greater Boston", "Toronto, Ontario, Canada", "London, England, United Kingdom", "Busan, South Korea",
+    "Miami-Fort Lauderdale Area", "Washington, D.C.", "Remote", "", "Phoenix, AZ", "Denver, Colorado",
+    "Bengaluru, Karnataka, India", "United States", "Seattle, Washington, United States", "Albany, NY",
+]
+HEADLINES = [
+    "Senior Loan Officer at Acme Mortgage", "Customer Service Representative | Helping families",
+    "Small Business Owner", "Realtor® with Keller Williams", "Financial Advisor - Retirement Planning",
+    "Registered Nurse", "Software Engineer", "Insurance Agent at State Farm", "High School Teacher",
+    "Sales Associate", "Real-Estate Agents Network", "Student at UT Austin", "Mortgage Advisor NMLS 12345",
+    "Founder & CEO", "Educator | Coach | Speaker", "Retail Sales Consultant", "",
+]
+
+
+class Case(NamedTuple):
+    name: str      # "<component>[<size>]", the baseline key
+    items: int     # pages or rows handled per call
+    unit: str
+    setup: Callable[[], Callable[[], object]]  # builds the fixtures, returns the timed call
+
+
+class Result(NamedTuple):
+    name: str
+    items_per_sec: float
+    peak_mb: float
+    unit: str
+
+
+# -------------------------------
+# Fixtures
+# -------------------------------
+# Fixtures are built lazily (and once per component) by Case.setup, so cases
+# deselected with -k never pay for their corpora or the fitted pipeline.
+def corpus(pool: List[str], n: int, seed: int = 0) -> np.ndarray:
+    """n strings drawn from `pool` (object array; cheap to build at 10^7 rows)."""
+    rng = np.random.default_rng(seed)
+    return np.asarray(pool, dtype=object)[rng.integers(0, len(pool), n)]
+
+
+def search_pages(n: int, saved: List[str]) -> List[str]:
+    if saved:
+        return saved
+    return [synthetic_search_page(25, seed) for seed in range(n)]
+
+
+def fitted_pipeline():
+    train = synthetic_training(5000)
+    pipe = build_pipeline(RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=1))
+    pipe.fit(prepare_frame(train), (train["Loan_Status"] == "Y").astype(int))
+    return pipe
+
+
+def flat_models(pipe):
+    """(flat, served) FlatForestModels of `pipe`: pure NumPy traversal, and the app/service model
+    that hands batches over FLAT_MAX_ROWS to the pickled pipeline. Loaded into memory, no files left."""
+    directory = tempfile.mkdtemp()
+    try:
+        pickle_path = os.path.join(directory, "loan_model.pkl")
+        with open(pickle_path, "wb") as f:
+            pickle.dump(pipe, f)
+        export_flat(pipe, os.path.join(directory, "flat"))
+        flat = FlatForestModel.load(os.path.join(directory, "flat"), mmap_mode=None)
+        served = FlatForestModel.load(os.path.join(directory, "flat"), mmap_mode=None, pickle_path=pickle_path)
+        served.pipeline()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return flat, served
+
+
+# -------------------------------
+# Components
+# -------------------------------
+# Each setup binds its fixtures as defaults of the returned call: `lambda s=s(): ...`
+def card_cases(sizes, saved) -> List[Case]:
+    cases = []
+    for n in ([len(saved)] if saved else sizes["pages"]):
+        pages = cache(partial(search_pages, n, saved))
+        label = f"{n} saved" if saved else str(n)
+        # Customer Service scrape_pages (OFFLINE_PARSE) and wfg scan_search_page
+        cases.append(Case(f"cs_search_cards[{label}]", n, "pages",
+                          lambda pages=pages: lambda pages=pages(): [parse_search_cards(p) for p in pages]))
+        cases.append(Case(f"wfg_open_to_work_cards[{label}]", n, "pages",
+                          lambda pages=pages: lambda pages=pages(): [parse_open_to_work_cards(p) for p in pages]))
+    return cases
+
+
+def filter_cases(sizes, saved) -> List[Case]:
+    from Customer_Service_updated import location_is_us_not_ny, headline_or_name_has_kw
+    try:
+        from linkedin_lead_scraper import matches_filters
+    except ImportError as e:  # undetected_chromedriver missing
+        print(f"⚠️ matches_filters skipped: {e}")
+        matches_filters = None
+
+    cases = []
+    for n in sizes["rows"]:
+        locations = cache(partial(corpus, LOCATIONS, n))
+        cases.append(Case(f"classify_locations[{n}]", n, "rows",
+                          lambda s=locations: lambda s=s(): classify_locations(pd.Series(s))))
+        if n > LOOP_MAX_ROWS:
+            continue
+        headlines = cache(partial(corpus, HEADLINES, n, seed=1))
+        # Worst case for classify_locations: no repeats, so nothing is shared between rows
+        distinct = cache(lambda n=n: pd.Series([f"{loc} {i}" for i, loc in enumerate(corpus(LOCATIONS, n, seed=2))]))
+        cases.append(Case(f"classify_locations_distinct[{n}]", n, "rows",
+                          lambda s=distinct: lambda s=s(): classify_locations(s)))
+        cases.append(Case(f"is_us_location[{n}]", n, "rows",
+                          lambda s=locations: lambda s=s(): [is_us_location(x) for x in s]))
+        cases.append(Case(f"location_is_us_not_ny[{n}]", n, "rows",
+                          lambda s=locations: lambda s=s(): [location_is_us_not_ny(x) for x in s]))
+        cases.append(Case(f"headline_or_name_has_kw[{n}]", n, "rows",
+                          lambda h=headlines: lambda h=h(): [headline_or_name_has_kw(x, "Member") for x in h]))
+        if matches_filters is not None:
+            cases.append(Case(f"matches_filters[{n}]", n, "rows",
+                              lambda s=locations, h=headlines:
+                                  lambda s=s(), h=h(): [matches_filters("Member", hl, loc) for hl, loc in zip(h, s)]))
+    return cases
+
+
+def loan_cases(sizes, saved) -> List[Case]:
+    pipe = cache(fitted_pipeline)
+    models = cache(lambda: flat_models(pipe()))
+    form = dict(APPLICANT)
+    cases = [Case("encode_inputs[1]", 1, "rows", lambda: lambda: encode_inputs(form))]
+    for n in sizes["applicants"]:
+        upload = cache(partial(synthetic_upload, n))
+        prepared = cache(lambda upload=upload: prepare_frame(upload()))
+        cases.append(Case(f"normalize_row[{n}]", n, "rows",
+                          lambda df=upload: lambda df=df(): [normalize_row(r) for _, r in df.iterrows()]))
+        cases.append(Case(f"prepare_frame[{n}]", n, "rows", lambda df=upload: lambda df=df(): prepare_frame(df)))
+        cases.append(Case(f"model_predict[{n}]", n, "rows",
+                          lambda x=prepared: lambda pipe=pipe(), x=x(): pipe.predict(x)))
+        # What the app and loan_service actually load (load_model): flat traversal vs served hybrid
+        cases.append(Case(f"flat_model_predict[{n}]", n, "rows",
+                          lambda x=prepared: lambda model=models()[0], x=x(): model.predict(x)))
+        cases.append(Case(f"served_model_predict[{n}]", n, "rows",
+                          lambda x=prepared: lambda model=models()[1], x=x(): model.predict(x)))
+    cases.append(Case("model_predict[1]", 1, "rows",
+                      lambda: lambda pipe=pipe(), single=encode_inputs(form): pipe.predict(single)))
+    cases.append(Case("flat_model_predict[1]", 1, "rows",
+                      lambda: lambda model=models()[0], single=encode_inputs(form): model.predict(single)))
+    # What-if sweep in the app: a 60 x 60 grid around one applicant, one predict_proba call
+    axes = {"LoanAmount": np.linspace(0, 800, 60).round(), "ApplicantIncome": np.linspace(0, 30_000, 60).round()}
+    cases.append(Case("sweep_predict_proba[3600]", 3600, "rows",
+                      lambda: lambda pipe=pipe(): approval_probability(pipe, sweep_inputs(form, axes)[1])))
+    return cases
+
+
+COMPONENTS = [card_cases, filter_cases, loan_cases]
+
+
+# -------------------------------
+# Measurement
+# -------------------------------
+def measure(case: Case) -> Result:
+    run = case.setup()
+    run()  # warm-up (regex/XPath compilation, lazy imports)
+    best = float("inf")
+    for _ in range(ROUNDS):
+        calls, t0 = 0, time.perf_counter()
+        while True:
+            run()
+            calls += 1
+            elapsed = time.perf_counter() - t0
+            if elapsed >= MIN_TIME_SEC:
+                break
+        best = min(best, elapsed / calls)
+    # Separate pass: tracemalloc slows allocation-heavy code, so it is kept out of the timing
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return Result(case.name, case.items / best, peak / 1e6, case.unit)
+
+
+def regressions(result: Result, baseline: dict, max_slowdown: float, max_growth: float) -> List[str]:
+    ref = baseline.get(result.name)
+    if ref is None:
+        return []
+    problems = []
+    if result.items_per_sec < ref["items_per_sec"] * (1 - max_slowdown):
+        problems.append(f"throughput {result.items_per_sec:,.0f} < baseline {ref['items_per_sec']:,.0f} {result.unit}/sec")
+    if result.peak_mb > max(ref["peak_mb"], 0.1) * (1 + max_growth):
+        problems.append(f"peak {result.peak_mb:.1f} MB > baseline {ref['peak_mb']:.1f} MB")
+    return problems
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path: str, results: List[Result], merged: Dict[str, dict]):
+    for r in results:
+        merged[r.name] = {"items_per_sec": r.items_per_sec, "peak_mb": r.peak_mb, "unit": r.unit}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"machine": platform.node(), "python": platform.python_version(),
+                   "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": merged}, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks with baseline regression checks.")
+    parser.add_argument("--scale", choices=sorted(SIZES), default="quick")
+    parser.add_argument("-k", dest="select", help="only cases whose name contains this text")
+    parser.add_argument("--pages", help="glob of saved search pages (.html / .html.gz) instead of synthetic ones")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="record these results as the new baseline")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="exit 2 when there is no baseline to compare against (for CI)")
+    parser.add_argument("--max-slowdown", type=float, default=MAX_SLOWDOWN)
+    parser.add_argument("--max-memory-growth", type=float, default=MAX_MEMORY_GROWTH)
+    args = parser.parse_args(argv)
+
+    saved = [read_page(p) for p in sorted(glob.glob(args.pages))] if args.pages else []
+    baseline = load_baseline(args.baseline)
+    if not baseline and not args.save_baseline:
+        if args.require_baseline:
+            print(f"❌ No baseline at {args.baseline} (record one on this machine with --save-baseline)")
+            return 2
+        print(f"⚠️ No baseline at {args.baseline}; reporting only (record one with --save-baseline)")
+
+    results, failed = [], []
+    for component in COMPONENTS:
+        for case in component(SIZES[args.scale], saved):
+            if args.select and args.select not in case.name:
+                continue
+            result = measure(case)
+            results.append(result)
+            problems = regressions(result, baseline, args.max_slowdown, args.max_memory_growth)
+            mark = "❌" if problems else "✅"
+            print(f"{mark} {result.name:<36} {result.items_per_sec:>14,.0f} {result.unit}/sec "
+                  f"| peak {result.peak_mb:8.1f} MB" + (f" | {'; '.join(problems)}" if problems else ""))
+            if problems:
+                failed.append(result.name)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, baseline)
+        print(f"💾 Baseline saved to {args.baseline} ({len(results)} cases)")
+        return 0
+    if failed:
+        print(f"❌ {len(failed)} regression(s): {', '.join(failed)}")
+        return 1
+    if not baseline:
+        print(f"⚠️ {len(results)} cases measured, none compared: no baseline at {args.baseline}")
+        return 0
+    print(f"✅ {len(results)} cases within thresholds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
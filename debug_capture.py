@@ -0,0 +1,112 @@
+import os
+import gzip
+import queue
+import threading
+from datetime import datetime
+from typing import List, Tuple
+
+# debug_capture.py
+# Background writer for debug page snapshots. The scrape loop only enqueues the
+# page source; a daemon thread gzips it into a directory whose total size is
+# capped (oldest files are deleted first). Failures are always kept, other
+# pages 1-in-N. When the writer falls behind, sampled pages are dropped first:
+# part of the queue is reserved for failures, which may also wait briefly.
+
+DEBUG_DIR = "debug_pages"
+MAX_TOTAL_BYTES = 200 * 1024 * 1024
+SAMPLE_EVERY = 10   # keep every Nth healthy page (1 = all, 0 = failures only)
+QUEUE_SIZE = 16     # pending snapshots
+FAILURE_RESERVE = 4  # queue slots sampled pages may not use
+FAILURE_WAIT_SEC = 5  # longest a failure snapshot waits for a free slot before it is dropped
+
+
+def read_page(path: str) -> str:
+    """Contents of a saved page, plain .html or a .html.gz written by DebugCapture."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+class DebugCapture:
+    def __init__(self, directory: str = DEBUG_DIR, max_total_bytes: int = MAX_TOTAL_BYTES,
+                 sample_every: int = SAMPLE_EVERY, queue_size: int = QUEUE_SIZE,
+                 failure_reserve: int = FAILURE_RESERVE):
+        self.directory = directory
+        self.max_total_bytes = max_total_bytes
+        self.sample_every = sample_every
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.sampled_limit = max(1, queue_size - failure_reserve)  # queue depth at which sampled pages drop
+        self.seen = 0
+        self.saved = 0
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        self.files = self._existing_files()
+        self.total_bytes = sum(size for _, size in self.files)
+        self.thread = threading.Thread(target=self._run, name="debug-capture", daemon=True)
+        self.thread.start()
+
+    def capture(self, label: str, page_source: str, failed: bool = False) -> bool:
+        """Queue a snapshot if the sampling policy keeps it. Sampled pages never block the caller;
+        a failure waits up to FAILURE_WAIT_SEC when even the reserved slots are taken."""
+        self.seen += 1
+        keep = failed or (self.sample_every > 0 and (self.seen - 1) % self.sample_every == 0)
+        if not keep or not page_source:
+            return False
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        name = f"{'fail_' if failed else ''}{label}_{stamp}.html.gz"
+        try:
+            if failed:
+                self.queue.put((name, page_source), timeout=FAILURE_WAIT_SEC)
+            elif self.queue.qsize() >= self.sampled_limit:
+                raise queue.Full
+            else:
+                self.queue.put_nowait((name, page_source))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def close(self, timeout: float = 30):
+        """Write out everything still queued, then stop the writer thread."""
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _existing_files(self) -> List[Tuple[str, int]]:
+        paths = [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".html.gz")]
+        paths.sort(key=os.path.getmtime)
+        return [(p, os.path.getsize(p)) for p in paths]
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            name, page_source = item
+            path = os.path.join(self.directory, name)
+            try:
+                data = gzip.compress(page_source.encode("utf-8"), compresslevel=6)
+                with open(path, "wb") as f:
+                    f.write(data)
+            except OSError as e:
+                print(f"⚠️ Debug capture failed for {name}: {e}")
+                continue
+            self.files.append((path, len(data)))
+            self.total_bytes += len(data)
+            self.saved += 1
+            self._rotate()
+
+    def _rotate(self):
+        # Oldest first, but never the snapshot that was just written
+        while self.total_bytes > self.max_total_bytes and len(self.files) > 1:
+            path, size = self.files.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.total_bytes -= size
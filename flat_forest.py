@@ -0,0 +1,133 @@
+import os
+import pickle
+import threading
+from typing import Optional
+
+import numpy as np
+
+# flat_forest.py
+# Compact export of the trained loan pipeline: the forest's trees are flattened
+# into a handful of plain .npy node arrays that load with mmap, so worker
+# processes share one copy through the page cache instead of each unpickling
+# 100 tree objects. The (small) fitted feature transformer stays a pickle.
+# The NumPy traversal wins on cold start and small batches only; larger batches
+# are handed to the pickled sklearn pipeline (unpickled on first use).
+
+FEATURES_FILE = "features.pkl"
+ARRAYS = ["left", "right", "feature", "threshold", "proba", "roots", "classes"]
+CHUNK_ROWS = 4096  # rows traversed at once (nodes matrix is rows x trees)
+FLAT_MAX_ROWS = 256  # above this sklearn's compiled traversal is faster (~2x at 1k rows, ~4x at 20k)
+
+
+def export_flat(pipeline, directory: str):
+    """Write the pipeline's feature step and its forest as flat node arrays into `directory`."""
+    forest = pipeline.steps[-1][1]
+    features = pipeline[:-1]
+    os.makedirs(directory, exist_ok=True)
+
+    left, right, feature, threshold, proba, roots = [], [], [], [], [], []
+    offset = 0
+    for est in forest.estimators_:
+        tree = est.tree_
+        is_leaf = tree.children_left == -1
+        roots.append(offset)
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        value = tree.value[:, 0, :]
+        proba.append(value / value.sum(axis=1, keepdims=True))
+        offset += tree.node_count
+
+    arrays = {
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "proba": np.concatenate(proba).astype(np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "classes": np.asarray(forest.classes_),
+    }
+    for name, arr in arrays.items():
+        np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(arr))
+    with open(os.path.join(directory, FEATURES_FILE), "wb") as f:
+        pickle.dump(features, f)
+
+
+def load_model(pickle_path: str, flat_dir: str):
+    """The flat export when `flat_dir` exists, else the pickled pipeline. A pickle newer than the
+    export (retrained without re-exporting) wins, with a warning."""
+    if os.path.isdir(flat_dir):
+        features_path = os.path.join(flat_dir, FEATURES_FILE)  # written last by export_flat
+        if (os.path.exists(pickle_path) and os.path.exists(features_path)
+                and os.path.getmtime(pickle_path) > os.path.getmtime(features_path)):
+            print(f"⚠️ {pickle_path} is newer than the flat export in {flat_dir}/; loading the pickle. "
+                  f"Re-run export_flat to use the flat model again.")
+        else:
+            return FlatForestModel.load(flat_dir, pickle_path=pickle_path)
+    with open(pickle_path, "rb") as f:
+        return pickle.load(f)
+
+
+class FlatForestModel:
+    """predict/predict_proba over raw FEATURE_COLUMNS rows, same results as the pickled pipeline.
+
+    With a `pickle_path`, batches over FLAT_MAX_ROWS rows are scored by that pipeline instead.
+    """
+
+    def __init__(self, features, arrays: dict, pickle_path: Optional[str] = None):
+        self.features = features
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.classes_ = self.classes
+        self.pickle_path = pickle_path
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = "r",
+             pickle_path: Optional[str] = None) -> "FlatForestModel":
+        with open(os.path.join(directory, FEATURES_FILE), "rb") as f:
+            features = pickle.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+                  for name in ARRAYS}
+        return cls(features, arrays, pickle_path)
+
+    def pipeline(self):
+        """The pickled sklearn pipeline for large batches (None without a readable pickle)."""
+        if self._pipeline is None and self.pickle_path and os.path.exists(self.pickle_path):
+            with self._pipeline_lock:
+                if self._pipeline is None:
+                    with open(self.pickle_path, "rb") as f:
+                        self._pipeline = pickle.load(f)
+        return self._pipeline
+
+    def predict_proba(self, X) -> np.ndarray:
+        if len(X) > FLAT_MAX_ROWS:
+            pipeline = self.pipeline()
+            if pipeline is not None:
+                return pipeline.predict_proba(X)
+        # sklearn trees compare float32 features against float64 thresholds
+        Xt = np.asarray(self.features.transform(X), dtype=np.float32)
+        out = np.empty((len(Xt), self.proba.shape[1]), dtype=np.float64)
+        for start in range(0, len(Xt), CHUNK_ROWS):
+            out[start:start + CHUNK_ROWS] = self._traverse(Xt[start:start + CHUNK_ROWS])
+        return out
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+
+    def _traverse(self, X: np.ndarray) -> np.ndarray:
+        # One entry per (row, tree); each step advances only the entries not yet at a leaf
+        n_trees = len(self.roots)
+        nodes = np.tile(np.asarray(self.roots), len(X))
+        rows = np.repeat(np.arange(len(X)), n_trees)
+        active = np.arange(len(nodes))
+        while active.size:
+            current = nodes[active]
+            left = self.left[current]
+            inner = left != -1
+            active, current, left = active[inner], current[inner], left[inner]
+            go_left = X[rows[active], self.feature[current]] <= self.threshold[current]
+            nodes[active] = np.where(go_left, left, self.right[current])
+        return self.proba[nodes].reshape(len(X), n_trees, -1).mean(axis=1)
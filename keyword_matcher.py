@@ -0,0 +1,83 @@
+import re
+from typing import Dict, Iterable, List
+
+# keyword_matcher.py
+# Role/title keyword matching shared by the scrapers. The keyword list is
+# compiled once into a single case-insensitive regex shaped like a trie (shared
+# prefixes are factored out), so the cost of a search grows with the text, not
+# with the number of keywords.
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().replace("-", " ").split())
+
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        ends_here = "" in node
+        branches = [(r"[\s\-]+" if ch == " " else re.escape(ch)) + build(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends_here:
+            # Greedy: try the longer keyword first, fall back to the shorter one
+            body = body + "?" if len(branches) == 1 and len(branches[0]) == 1 else "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Compiled keyword list: whole-word, case-insensitive, plural "s"/"es" allowed,
+    spaces in a keyword match any run of spaces or hyphens.
+
+    `matches` returns the canonical keywords found (in keyword-list order), so
+    leads can be tagged by role; `classify`/`tag` take a pandas Series or a list.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+        self.canonical = {_normalize(k): k for k in self.keywords}
+        self.order = {k: i for i, k in enumerate(self.keywords)}
+        terms = sorted(self.canonical)
+        self.pattern = re.compile(
+            rf"(?<![a-z0-9])(?:{_trie_regex(terms)})(?:e?s)?(?![a-z0-9])" if terms else r"(?!)",
+            re.IGNORECASE,
+        )
+
+    def __call__(self, *texts: str) -> bool:
+        """True when any of the texts contains a keyword."""
+        search = self.pattern.search
+        return any(text and search(text) is not None for text in texts)
+
+    def _canonical(self, found: str) -> str:
+        key = _normalize(found)
+        for candidate in (key, key[:-1], key[:-2]):
+            if candidate in self.canonical:
+                return self.canonical[candidate]
+        return key
+
+    def matches(self, *texts: str) -> List[str]:
+        """Distinct keywords found across the texts, in keyword-list order."""
+        found = {self._canonical(m.group(0)) for text in texts if text for m in self.pattern.finditer(text)}
+        return sorted(found, key=lambda k: self.order.get(k, len(self.order)))
+
+    def classify(self, texts):
+        """Vectorized any-match: a pandas Series in, boolean Series out; any other iterable gives a list."""
+        if hasattr(texts, "str"):
+            return texts.fillna("").astype(str).str.contains(self.pattern, regex=True)
+        return [self(t) for t in texts]
+
+    def tag(self, texts, sep: str = "; "):
+        """Matched keywords joined by `sep` per text (Series in, Series out; otherwise a list)."""
+        if hasattr(texts, "str"):
+            return texts.fillna("").astype(str).map(lambda t: sep.join(self.matches(t)))
+        return [sep.join(self.matches(t)) for t in texts]
@@ -0,0 +1,228 @@
+import os
+import csv
+import sys
+import glob
+import time
+import argparse
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from lead_store import AppendOnlyCsv
+
+# lead_record.py
+# One lead type shared by the three scrapers, plus writers for it. The CSV
+# writer keeps each script's historical column layout (duplicated
+# headline in "Company/Title" included) so existing sheets and resume logic keep
+# working. The Parquet writer stores every lead once in typed columns.
+# Repetitive text (location, headline, source, run ID, roles) is
+# dictionary-encoded, so multi-million-row archives are much smaller and load
+# back as pandas categoricals.
+#
+#   python lead_record.py small_business_owner_us_before_*.csv --out leads_parquet
+#   pd.read_parquet("leads_parquet")
+
+
+class LeadRecord(NamedTuple):
+    source: str                              # "customer_service", "wfg", "linkedin"
+    run_id: str
+    url: str
+    name: str = ""
+    headline: str = ""
+    location: str = ""
+    open_to_work: Optional[bool] = None      # None when the scraper does not check the badge
+    recent_activity: Optional[bool] = None   # None when activity was not checked
+    qualified: Optional[bool] = None         # passed the script's lead filters
+    matched_roles: str = ""
+    scraped_at: Optional[datetime] = None    # UTC; filled in by the writer when missing
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+class CsvLayout(NamedTuple):
+    header: List[str]
+    row: Callable[[LeadRecord], List[str]]
+
+
+def _yes_no(flag: Optional[bool]) -> str:
+    return "Yes" if flag else "No"
+
+
+# Historical per-script CSV layouts
+LAYOUTS: Dict[str, CsvLayout] = {
+    "customer_service": CsvLayout(["Name", "Headline", "LinkedIn URL", "Company/Title", "Location"],
+                                  lambda r: [r.name, r.headline, r.url, r.headline, r.location]),
+    "wfg_open_to_work": CsvLayout(["Name", "Headline", "Location", "LinkedIn URL"],
+                                  lambda r: [r.name, r.headline, r.location, r.url]),
+    "wfg_all_profiles": CsvLayout(["Name", "Headline", "Location", "LinkedIn URL", "OpenToWork"],
+                                  lambda r: [r.name, r.headline, r.location, r.url, _yes_no(r.open_to_work)]),
+    "linkedin": CsvLayout(["Name", "Headline", "LinkedIn URL", "Company/Title", "Matched Roles"],
+                          lambda r: [r.name, r.headline, r.url, r.headline, r.matched_roles]),
+}
+
+# CSV column -> LeadRecord field, for converting existing files ("Company/Title" repeats the headline)
+CSV_FIELDS = {"Name": "name", "Headline": "headline", "Location": "location", "LinkedIn URL": "url",
+              "OpenToWork": "open_to_work", "Matched Roles": "matched_roles"}
+
+
+class CsvLeadWriter(AppendOnlyCsv):
+    """AppendOnlyCsv that takes LeadRecords and writes them in one of the LAYOUTS."""
+
+    def __init__(self, path: str, layout: str, flush_every: int = 10, flush_first=()):
+        self.layout = LAYOUTS[layout]
+        super().__init__(path, self.layout.header, flush_every, flush_first)
+
+    def append(self, record: LeadRecord):
+        super().append(self.layout.row(record))
+
+
+# -------------------------------
+# Parquet
+# -------------------------------
+ROW_GROUP_ROWS = 100_000
+DICTIONARY_COLUMNS = ["source", "run_id", "headline", "location", "matched_roles"]
+
+
+def lead_schema():
+    import pyarrow as pa
+
+    text = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("source", text),
+        ("run_id", text),
+        ("url", pa.string()),
+        ("name", pa.string()),
+        ("headline", text),
+        ("location", text),
+        ("open_to_work", pa.bool_()),
+        ("recent_activity", pa.bool_()),
+        ("qualified", pa.bool_()),
+        ("matched_roles", text),
+        ("scraped_at", pa.timestamp("s", tz="UTC")),
+    ])
+
+
+class ParquetLeadWriter:
+    """Buffers LeadRecords into row groups of one new part file under `directory`.
+
+    The file is written as a hidden .tmp and renamed on close(), so readers of
+    the directory (pd.read_parquet(directory)) never see a half-written part.
+    """
+
+    def __init__(self, directory: str, row_group_rows: int = ROW_GROUP_ROWS):
+        import pyarrow as pa  # optional dependency: only needed when Parquet output is requested
+        import pyarrow.parquet as pq
+
+        self.pa, self.pq = pa, pq
+        self.schema = lead_schema()
+        self.row_group_rows = row_group_rows
+        self.buffer: List[LeadRecord] = []
+        self.rows = 0
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}.parquet"
+        self.path = os.path.join(directory, name)
+        self.tmp_path = os.path.join(directory, f".{name}.tmp")
+        self.writer = None
+
+    def append(self, record: LeadRecord):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.row_group_rows:
+            self.flush()
+
+    def extend(self, records: Iterable[LeadRecord]):
+        for record in records:
+            self.append(record)
+
+    def flush(self):
+        """Write buffered records as one row group."""
+        if not self.buffer:
+            return
+        now = utc_now()
+        columns = {f: [getattr(r, f) for r in self.buffer] for f in LeadRecord._fields}
+        columns["scraped_at"] = [t or now for t in columns["scraped_at"]]
+        arrays = [self.pa.array(columns[field.name], type=field.type.value_type
+                                if self.pa.types.is_dictionary(field.type) else field.type).cast(field.type)
+                  for field in self.schema]
+        table = self.pa.Table.from_arrays(arrays, schema=self.schema)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.tmp_path, self.schema, compression="zstd",
+                                                use_dictionary=DICTIONARY_COLUMNS)
+        self.writer.write_table(table)
+        self.rows += len(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            os.replace(self.tmp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LeadSink:
+    """Fans each record out to several writers (e.g. a CsvLeadWriter and a ParquetLeadWriter)."""
+
+    def __init__(self, *writers):
+        self.writers = [w for w in writers if w is not None]
+
+    def append(self, record: LeadRecord):
+        for w in self.writers:
+            w.append(record)
+
+    def flush(self):
+        for w in self.writers:
+            w.flush()
+
+    def close(self):
+        for w in self.writers:
+            w.close()
+
+
+# -------------------------------
+# Converting existing CSVs
+# -------------------------------
+def records_from_csv(path: str, source: str, run_id: str, qualified: Optional[bool] = None) -> Iterable[LeadRecord]:
+    """LeadRecords from a CSV in any of the LAYOUTS (columns matched by header name)."""
+    scraped_at = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc).replace(microsecond=0)
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        fields = [(i, CSV_FIELDS[h]) for i, h in enumerate(header) if h in CSV_FIELDS]
+        for row in reader:
+            values = {field: row[i] for i, field in fields if i < len(row)}
+            if not values.get("url"):
+                continue
+            if "open_to_work" in values:
+                values["open_to_work"] = values["open_to_work"] == "Yes"
+            yield LeadRecord(source, run_id, qualified=qualified, scraped_at=scraped_at, **values)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Convert lead CSVs (any scraper layout) to a Parquet dataset.")
+    parser.add_argument("inputs", nargs="+", help="CSV files or globs")
+    parser.add_argument("--out", default="leads_parquet", help="dataset directory (a new part file per run)")
+    parser.add_argument("--source", help="source label (default: guessed from the file name)")
+    parser.add_argument("--qualified", action="store_true", help="the inputs hold filtered leads only")
+    args = parser.parse_args(argv)
+
+    paths = [p for pattern in args.inputs for p in (sorted(glob.glob(pattern)) or [pattern])]
+    with ParquetLeadWriter(args.out) as writer:
+        for path in paths:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            source = args.source or ("wfg" if "open_to_work" in stem or "all_profiles" in stem
+                                     else "linkedin" if stem.startswith("linkedin_us_profiles") else "customer_service")
+            before = writer.rows + len(writer.buffer)
+            writer.extend(records_from_csv(path, source, stem, True if args.qualified else None))
+            print(f"📥 {path}: {writer.rows + len(writer.buffer) - before} leads ({source})")
+    print(f"✅ {writer.rows} leads written to {writer.path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,108 @@
+import csv
+import os
+import json
+import time
+from typing import List, Set
+
+# lead_store.py
+# Append-only CSV output for long scraping runs: each row is written once,
+# flushed to disk every `flush_every` rows, and a crashed run can be resumed by
+# reading back only the key column.
+
+
+class AppendOnlyCsv:
+    """CSV file opened for appending; writes the header only when the file is new.
+
+    `flush_first` lists other stores that must reach disk before this one, e.g.
+    the leads file before the resume log that marks those URLs as processed.
+    """
+
+    def __init__(self, path: str, header: List[str], flush_every: int = 10, flush_first=()):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.flush_first = list(flush_first)
+        self.pending = 0
+
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        needs_newline = not is_new and not _ends_with_newline(path)
+        self.f = open(path, "a", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.f)
+        if needs_newline:
+            # a crash mid-row left a partial last line; start the next row cleanly
+            self.f.write("\r\n")
+        if is_new:
+            self.writer.writerow(header)
+            self.flush()
+
+    def append(self, row: List[str]):
+        self.writer.writerow(row)
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        for other in self.flush_first:
+            if not other.f.closed:
+                other.flush()
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.pending = 0
+
+    def close(self):
+        if not self.f.closed:
+            self.flush()
+            self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RunCheckpoint:
+    """Small JSON progress record (e.g. last completed page), replaced atomically on every save."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def save(self, **fields):
+        self.state.update(fields, updated_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) in (b"\n", b"\r")
+
+
+def read_column(path: str, index: int) -> Set[str]:
+    """Values of one column (header skipped) from an existing CSV, for crash-resume."""
+    values: Set[str] = set()
+    if not os.path.exists(path):
+        return values
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if len(row) > index and row[index]:
+                values.add(row[index])
+    return values
+
+
+def count_rows(path: str) -> int:
+    """Data rows (header excluded) in an existing CSV."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
@@ -1,8 +1,22 @@
-import csv
 import time
+import argparse
+from functools import partial
 from datetime import datetime
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from location_rules import is_us_location
+from keyword_matcher import KeywordMatcher
+from debug_capture import DebugCapture
+from page_cache import PageCache
+from url_index import UrlIndex
+from search_parser import parse_search_cards, parse_activity_stamps
+from activity_check import ActivityCache, newest_activity_age
+from scraper_cli import add_common_args, parse_args, page_range, configure_chrome, ensure_login, close_browser
+from run_metrics import RunMetrics
+from lead_record import LeadRecord, CsvLeadWriter, ParquetLeadWriter, utc_now
 
 # ---------------- CONFIG ----------------
 KEYWORDS = [
@@ -10,108 +24,215 @@ KEYWORDS = [
     "Real Estate Agent", "Mortgage Advisor", "Loan Officer", "Insurance Agent",
     "Financial Advisor", "Teacher", "Educator"
 ]
-EXCLUDED_LOCATIONS = ["New York"]
+ROLE_MATCHER = KeywordMatcher(KEYWORDS)  # compiled once; also tags each lead with its matched roles
 RECENT_DAYS = 21  # activity window in days
-CSV_FILE = f"linkedin_us_profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+RUN_ID = datetime.now().strftime('%Y%m%d_%H%M%S')
+CSV_FILE = f"linkedin_us_profiles_{RUN_ID}.csv"
+DEBUG_DIR = "debug_pages"  # gzipped page snapshots, oldest deleted past DEBUG_MAX_MB
+DEBUG_MAX_MB = 200
+DEBUG_SAMPLE_EVERY = 10  # keep 1 in N pages; pages with no result cards are always kept
+PAGE_CACHE_PATH = "page_cache.sqlite"  # shared with the other scrapers; --replay reads only from it
+PAGE_CACHE_TTL_HOURS = 24
+ACTIVITY_WAIT_SEC = 8  # explicit wait for post timestamps on /recent-activity/
+ACTIVITY_STAMP_CSS = "span.update-components-actor__sub-description"
+ACTIVITY_CACHE_PATH = "activity_cache.json"  # newest post age per profile URL
+ACTIVITY_CACHE_TTL_HOURS = 24
+URL_INDEX_PATH = "url_index.sqlite"  # profiles handled by earlier runs are skipped
+
+metrics = RunMetrics("linkedin", RUN_ID)  # stage timers/counters, written at the end of main()
 
 # -----------------------------------------
 
-def login_to_linkedin(driver):
-    print("🔐 Browser is open. Please log in manually.")
-    input("✅ Once logged in and redirected to the LinkedIn homepage, press Enter here to start scraping...")
+def login_to_linkedin(driver, args):
+    return ensure_login(driver, args,
+                        "✅ Once logged in and redirected to the LinkedIn homepage, press Enter here to start scraping...")
 
-def is_recent_activity(driver, profile_url):
-    """Check if the profile has activity in the last RECENT_DAYS days."""
+def load_page(driver, url, settle_sec):
+    with metrics.stage("page_load"):
+        driver.get(url)
+    with metrics.stage("settle"):
+        time.sleep(settle_sec)
+    return driver.page_source
+
+def load_activity_page(driver, activity_url):
+    """Load an activity page in the current tab, waiting for post timestamps rather than a fixed sleep."""
+    driver.get(activity_url)
     try:
-        driver.get(profile_url + "/recent-activity/")
-        time.sleep(3)
-        posts = driver.find_elements(By.XPATH, "//span[contains(@class,'update-components-actor__sub-description')]")
-        for post in posts:
-            text = post.text.lower()
-            if any(x in text for x in ["h", "hour", "minute", "day", "week"]):
-                if "week" in text:
-                    weeks = int(''.join(filter(str.isdigit, text)) or "0")
-                    if weeks <= RECENT_DAYS // 7:
-                        return True
-                elif "day" in text:
-                    days = int(''.join(filter(str.isdigit, text)) or "0")
-                    if days <= RECENT_DAYS:
-                        return True
-                else:
-                    return True
-        return False
-    except:
-        return False
+        WebDriverWait(driver, ACTIVITY_WAIT_SEC, poll_frequency=0.2).until(
+            lambda d: d.find_elements(By.CSS_SELECTOR, ACTIVITY_STAMP_CSS))
+    except TimeoutException:
+        metrics.incr("wait_timeouts", page="activity")  # no posts (or slow page): parse whatever rendered
+    return driver.page_source
+
+def activity_verdicts(driver, profile_urls, cache, activity_cache, replay=False):
+    """Phase 2: {url: has activity within RECENT_DAYS} for the filtered candidates of one page.
+
+    Fresh cached verdicts are used as-is; the rest are checked in a dedicated tab,
+    so the search results tab is never navigated away mid-page.
+    """
+    verdicts = {}
+    todo = []
+    for url in profile_urls:
+        cached = activity_cache.is_recent(url, RECENT_DAYS)
+        if cached is None:
+            todo.append(url)
+        else:
+            verdicts[url] = cached
+            metrics.incr("activity_checks", source="activity_cache")
+    if not todo:
+        return verdicts
+
+    search_tab = None
+    if driver is not None:
+        search_tab = driver.current_window_handle
+        driver.switch_to.new_window("tab")
+    try:
+        for url in todo:
+            activity_url = url + "/recent-activity/"
+            try:
+                with metrics.stage("activity_check"):
+                    page_source = cache.fetch(activity_url, partial(load_activity_page, driver, activity_url), replay)
+            except Exception as e:
+                print(f"    ⚠️ Activity check failed for {url}: {e}")
+                metrics.incr("activity_checks", source="failed")
+                continue
+            if page_source is None:
+                continue  # replay: never fetched
+            metrics.incr("activity_checks", source="page")
+            newest = newest_activity_age(parse_activity_stamps(page_source))
+            activity_cache.record(url, newest)
+            verdicts[url] = newest is not None and newest <= RECENT_DAYS
+    finally:
+        if search_tab is not None:
+            driver.close()
+            driver.switch_to.window(search_tab)
+        activity_cache.save()
+    return verdicts
 
 def matches_filters(name, headline, location):
     """Check location and keyword filters."""
-    if not location or "united states" not in location.lower():
-        return False
-    if any(ex.lower() in location.lower() for ex in EXCLUDED_LOCATIONS):
+    if not is_us_location(location):
+        metrics.incr("filter_rejects", reason="location")
         return False
-    if not any(kw.lower() in (headline or "").lower() for kw in KEYWORDS):
+    if not ROLE_MATCHER(headline):
+        metrics.incr("filter_rejects", reason="keyword")
         return False
     return True
 
-def scrape_search_results(driver, start_page, end_page):
-    results = []
+def scrape_search_results(driver, start_page, end_page, cache, activity_cache, writer, debug_capture=None,
+                          replay=False, url_index=None, parquet=None):
+    """Stream qualified LeadRecords to `writer` (flushed after every page) and return how many were saved;
+    every activity-checked candidate also goes to `parquet`, if given."""
+    saved = 0
+    seen = set()
     for page in range(start_page, end_page + 1):
         print(f"🔎 Scraping page {page}")
-        driver.get(f"https://www.linkedin.com/search/results/people/?page={page}")
-        time.sleep(4)
-
-        # Save raw HTML for debugging before filtering
-        with open(f"debug_page_{page}.html", "w", encoding="utf-8") as dbg:
-            dbg.write(driver.page_source)
-        print(f"    💾 Saved raw HTML to debug_page_{page}.html")
-
-        profiles = driver.find_elements(By.XPATH, "//li[contains(@class,'reusable-search__result-container')]")
+        search_url = f"https://www.linkedin.com/search/results/people/?page={page}"
+        t_page = time.perf_counter()
+        with metrics.stage("fetch_page"):
+            # Pages without result cards (login walls, empty loads) are not cached
+            page_source = cache.fetch(search_url, partial(load_page, driver, search_url, 4), replay,
+                                      valid=lambda html: bool(parse_search_cards(html)))
+        if page_source is None:
+            print(f"  ⏩ Page {page} is not in the page cache, skipped")
+            metrics.incr("pages_skipped", reason="not_cached")
+            continue
+
+        # Cards parsed from the HTML snapshot (same as a cached page in replay mode)
+        with metrics.stage("parse_cards"):
+            profiles = parse_search_cards(page_source)
         print(f"  ➕ Found {len(profiles)} profiles on page {page}")
-
-        for prof in profiles:
-            try:
-                name_el = prof.find_element(By.XPATH, ".//span[@dir='ltr']")
-                headline_el = prof.find_element(By.CLASS_NAME, "entity-result__primary-subtitle")
-                location_el = prof.find_element(By.CLASS_NAME, "entity-result__secondary-subtitle")
-                link_el = prof.find_element(By.TAG_NAME, "a")
-
-                name = name_el.text.strip()
-                headline = headline_el.text.strip() if headline_el else ""
-                location = location_el.text.strip() if location_el else ""
-                profile_url = link_el.get_attribute("href").split("?")[0]
-
-                if matches_filters(name, headline, location):
-                    if is_recent_activity(driver, profile_url):
-                        print(f"    ✅ Match: {name} ({location})")
-                        results.append([name, headline, profile_url, headline])
-                    else:
-                        print(f"    ⏩ Skipped (no recent activity): {name}")
-                else:
-                    print(f"    ⏩ Skipped (filters): {name}")
-
-            except Exception as e:
-                print("    ⚠️ Error parsing profile:", e)
-    return results
+        metrics.incr("cards_seen", len(profiles))
+        for field, i in (("name", 0), ("headline", 1), ("location", 2)):
+            metrics.incr("selector_misses", sum(1 for p in profiles if not p[i]), field=field)
+
+        # Raw HTML for debugging, written in the background (always kept when the page came back empty)
+        if debug_capture is not None:
+            debug_capture.capture(f"search_page_{page}", page_source, failed=not profiles)
+
+        # Phase 1: filter every card on the page before any navigation
+        candidates = []
+        for name, headline, location, profile_url in profiles:
+            if profile_url in seen or (url_index is not None and profile_url in url_index):
+                metrics.incr("profiles_skipped", reason="seen")
+                continue
+            seen.add(profile_url)
+            if matches_filters(name, headline, location):
+                candidates.append((name, headline, location, profile_url))
+            else:
+                print(f"    ⏩ Skipped (filters): {name}")
+
+        # Phase 2: activity checks for the survivors
+        verdicts = activity_verdicts(driver, [c[3] for c in candidates], cache, activity_cache, replay)
+        for name, headline, location, profile_url in candidates:
+            recent = verdicts.get(profile_url)
+            lead = LeadRecord("linkedin", RUN_ID, profile_url, name, headline, location, recent_activity=recent,
+                              qualified=bool(recent), matched_roles="; ".join(ROLE_MATCHER.matches(headline)),
+                              scraped_at=utc_now())
+            if parquet is not None and recent is not None:
+                parquet.append(lead)
+            if recent:
+                print(f"    ✅ Match: {name} ({location})")
+                writer.append(lead)
+                saved += 1
+                metrics.incr("leads_saved")
+            else:
+                print(f"    ⏩ Skipped (no recent activity): {name}")
+                metrics.incr("filter_rejects", reason="no_recent_activity")
+
+        with metrics.stage("csv_write"):
+            writer.flush()
+        # Only URLs whose rows are on disk are marked as handled for later runs
+        if url_index is not None:
+            url_index.add_many(c[3] for c in candidates if c[3] in verdicts)
+        metrics.observe("page_seconds", time.perf_counter() - t_page)
+    return saved
 
 def main():
-    start_page = int(input("Enter start page (e.g., 1): "))
-    end_page = int(input("Enter end page (e.g., 5): "))
-
-    options = uc.ChromeOptions()
-    options.add_argument("--start-maximized")
-    driver = uc.Chrome(options=options)
-
-    login_to_linkedin(driver)
-    data = scrape_search_results(driver, start_page, end_page)
-
-    with open(CSV_FILE, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Name", "Headline", "LinkedIn URL", "Company/Title"])
-        writer.writerows(data)
-
-    print(f"✅ Done. {len(data)} profiles saved to {CSV_FILE}")
-    input("Press Enter to close the browser...")
-    driver.quit()
+    parser = argparse.ArgumentParser(description="Scrape US LinkedIn profiles matching KEYWORDS with recent activity.")
+    parser.add_argument("--replay", action="store_true",
+                        help=f"re-run parsing and filters from {PAGE_CACHE_PATH} only (no browser)")
+    parser.add_argument("--no-index", action="store_true",
+                        help=f"ignore {URL_INDEX_PATH} and revisit profiles from earlier runs")
+    add_common_args(parser)
+    args = parse_args(parser)
+
+    start_page, end_page = page_range(args, parser)
+
+    activity_cache = ActivityCache(ACTIVITY_CACHE_PATH, ACTIVITY_CACHE_TTL_HOURS)
+    writer = CsvLeadWriter(CSV_FILE, "linkedin")
+    parquet = ParquetLeadWriter(args.parquet_dir) if args.parquet_dir else None
+    driver = None
+    try:
+        with PageCache(PAGE_CACHE_PATH, PAGE_CACHE_TTL_HOURS) as cache:
+            if args.replay:
+                saved = scrape_search_results(None, start_page, end_page, cache, activity_cache, writer, replay=True,
+                                              parquet=parquet)
+            else:
+                driver = uc.Chrome(options=configure_chrome(uc.ChromeOptions(), args))
+
+                with metrics.stage("login"):
+                    login_to_linkedin(driver, args)
+                with DebugCapture(DEBUG_DIR, DEBUG_MAX_MB * 1024 * 1024, DEBUG_SAMPLE_EVERY) as debug_capture:
+                    url_index = None if args.no_index else UrlIndex(URL_INDEX_PATH, "linkedin")
+                    try:
+                        saved = scrape_search_results(driver, start_page, end_page, cache, activity_cache, writer,
+                                                      debug_capture, url_index=url_index, parquet=parquet)
+                    finally:
+                        if url_index is not None:
+                            url_index.close()
+            print(f"📦 Page cache hits {cache.hits} / misses {cache.misses}")
+            metrics.incr("page_cache", cache.hits, result="hit")
+            metrics.incr("page_cache", cache.misses, result="miss")
+            metrics.incr("page_cache", cache.rejected, result="rejected")
+    finally:
+        writer.close()
+        if parquet is not None:
+            parquet.close()
+        metrics.finish(args.metrics_dir, args.prom_textfile)
+        close_browser(driver, args)
+
+    print(f"✅ Done. {saved} profiles saved to {CSV_FILE}")
 
 if __name__ == "__main__":
     main()
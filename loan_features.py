@@ -0,0 +1,138 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OrdinalEncoder
+
+# loan_features.py
+# The feature contract shared by train_loan_model.py and the app. Training fits
+# build_pipeline() (imputation + encoding + model) and pickles it as one artifact;
+# the app feeds it raw rows in FEATURE_COLUMNS order and never encodes by hand.
+
+FEATURE_COLUMNS = ["Gender", "Married", "Dependents", "Education", "Self_Employed",
+                   "ApplicantIncome", "CoapplicantIncome", "LoanAmount", "Loan_Amount_Term",
+                   "Credit_History", "Property_Area"]
+
+# Category codes (sorted labels, as LabelEncoder assigned them)
+MAPPING = {
+    "Gender": {"Female": 0, "Male": 1},
+    "Married": {"No": 0, "Yes": 1},
+    "Dependents": {"0": 0, "1": 1, "2": 2, "3+": 3},
+    "Education": {"Graduate": 0, "Not Graduate": 1},
+    "Self_Employed": {"No": 0, "Yes": 1},
+    "Property_Area": {"Rural": 0, "Semiurban": 1, "Urban": 2},
+}
+CATEGORICAL_COLUMNS = list(MAPPING)
+FLAG_COLUMNS = ["Credit_History"]
+NUMERIC_COLUMNS = ["ApplicantIncome", "CoapplicantIncome", "LoanAmount", "Loan_Amount_Term"]
+CATEGORIES = {col: sorted(codes, key=codes.get) for col, codes in MAPPING.items()}
+# Compact dtypes for reading the training CSV
+CSV_DTYPES = {**{c: "category" for c in CATEGORICAL_COLUMNS + ["Loan_Status"]},
+              **{c: "float32" for c in NUMERIC_COLUMNS + FLAG_COLUMNS}}
+GOOD_CREDIT = ["1", "1.0", "Good (1)", "good", "Good"]
+
+APPROVED = "✅ Loan Approved"
+REJECTED = "❌ Loan Rejected"
+
+
+def _positions(columns: List[str]) -> List[int]:
+    return [FEATURE_COLUMNS.index(c) for c in columns]
+
+
+def build_pipeline(model) -> Pipeline:
+    """Imputation and encoding in front of `model`, addressed by column position so plain arrays work."""
+    categorical = Pipeline([
+        ("impute", SimpleImputer(strategy="most_frequent")),
+        ("encode", OrdinalEncoder(categories=[CATEGORIES[c] for c in CATEGORICAL_COLUMNS],
+                                  handle_unknown="use_encoded_value", unknown_value=-1)),
+    ])
+    features = ColumnTransformer([
+        ("categorical", categorical, _positions(CATEGORICAL_COLUMNS)),
+        ("flag", SimpleImputer(strategy="most_frequent"), _positions(FLAG_COLUMNS)),
+        ("numeric", SimpleImputer(strategy="median"), _positions(NUMERIC_COLUMNS)),
+    ])
+    return Pipeline([("features", features), ("model", model)])
+
+
+def encode_inputs(form_data: dict) -> np.ndarray:
+    """One raw model input row (1 x FEATURE_COLUMNS object array) from the friendly form values."""
+    credit = form_data["Credit_History"]
+    if isinstance(credit, str):
+        credit = 1 if credit.strip() in GOOD_CREDIT else 0
+    return np.array([[credit if c == "Credit_History" else form_data[c] for c in FEATURE_COLUMNS]], dtype=object)
+
+
+def sweep_inputs(form_data: dict, axes: Dict[str, np.ndarray]) -> Tuple[pd.DataFrame, np.ndarray]:
+    """What-if grid around one applicant: every combination of the swept columns' values.
+
+    Returns the grid (one column per swept feature) and the matching raw model
+    input, the applicant's row repeated with the swept columns overwritten.
+    """
+    names = list(axes)
+    mesh = np.meshgrid(*[np.asarray(axes[n]) for n in names], indexing="ij")
+    grid = pd.DataFrame({n: m.ravel() for n, m in zip(names, mesh)})
+    X = np.repeat(encode_inputs(form_data), len(grid), axis=0)
+    for n in names:
+        X[:, FEATURE_COLUMNS.index(n)] = grid[n].tolist()
+    return grid, X
+
+
+def approval_probability(model, X) -> np.ndarray:
+    """P(approved) per row, from one predict_proba call."""
+    proba = model.predict_proba(X)
+    return proba[:, list(model.classes_).index(1)]
+
+
+def _string_mask(col: pd.Series) -> pd.Series:
+    if col.dtype != object and not pd.api.types.is_string_dtype(col.dtype):
+        return pd.Series(False, index=col.index)
+    return col.map(type).eq(str)
+
+
+def _as_int(values: pd.Series) -> np.ndarray:
+    # int(v) semantics: truncate floats, parse numeric strings, refuse missing values
+    if values.isna().any():
+        raise ValueError("cannot convert missing value to integer")
+    return values.to_numpy().astype(np.int64)
+
+
+def _category_labels(col: pd.Series, categories: List[str]) -> np.ndarray:
+    # Labels pass through; already-numeric codes from older exports are mapped back to labels
+    values = col.to_numpy(dtype=object, copy=True)  # never write into the caller's frame
+    is_code = ~(_string_mask(col) | col.isna()).to_numpy()
+    if is_code.any():
+        codes = _as_int(col[is_code])
+        bad = (codes < 0) | (codes >= len(categories))
+        if bad.any():
+            raise ValueError(f"{col.name}: category code {codes[bad][0]} out of range 0..{len(categories) - 1}")
+        values[is_code] = np.asarray(categories, dtype=object)[codes]
+    return values
+
+
+def _credit_flags(col: pd.Series) -> np.ndarray:
+    values = col.to_numpy(dtype=object, copy=True)
+    is_str = _string_mask(col).to_numpy()
+    if is_str.any():
+        values[is_str] = col[is_str].str.strip().isin(GOOD_CREDIT).to_numpy(dtype=np.int64)
+    return values
+
+
+def prepare_frame(df: pd.DataFrame) -> np.ndarray:
+    """Raw model input (object array, FEATURE_COLUMNS order) for an uploaded batch; missing values are left to the pipeline's imputers."""
+    out = np.empty((len(df), len(FEATURE_COLUMNS)), dtype=object)
+    for i, k in enumerate(FEATURE_COLUMNS):
+        col = df[k]
+        if k in CATEGORIES:
+            out[:, i] = _category_labels(col, CATEGORIES[k])
+        elif k == "Credit_History":
+            out[:, i] = _credit_flags(col)
+        else:
+            out[:, i] = col.to_numpy(dtype=object)
+    return out
+
+
+def predict_labels(preds) -> np.ndarray:
+    return np.where(np.asarray(preds) == 1, APPROVED, REJECTED)
@@ -1,7 +1,18 @@
-import pickle
+import io
+import os
+import time
+import hashlib
+import altair as alt
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from flat_forest import FlatForestModel, load_model
+from loan_service import LoanServiceClient
+from prediction_cache import PredictionCache, model_fingerprint
+from loan_features import (FEATURE_COLUMNS, NUMERIC_COLUMNS, APPROVED, REJECTED, encode_inputs, prepare_frame,
+                           predict_labels, sweep_inputs, approval_probability)
+
 st.set_page_config(page_title="Loan Approval Predictor", page_icon="💳")
 
 st.title("💳 Loan Approval Predictor")
@@ -10,48 +21,103 @@ st.write("Use this app to predict whether a loan application would be approved b
 # ----------------------------
 # Utilities
 # ----------------------------
-@st.cache_resource
-def load_model(path: str):
-    with open(path, "rb") as f:
-        return pickle.load(f)
-
-def encode_inputs(form_data: dict) -> pd.DataFrame:
-    """Convert friendly form inputs into the numeric features expected by the model."""
-    mapping = {
-        "Gender": {"Female": 0, "Male": 1},
-        "Married": {"No": 0, "Yes": 1},
-        "Dependents": {"0": 0, "1": 1, "2": 2, "3+": 3},
-        "Education": {"Graduate": 0, "Not Graduate": 1},
-        "Self_Employed": {"No": 0, "Yes": 1},
-        "Property_Area": {"Rural": 0, "Semiurban": 1, "Urban": 2},
-    }
-    row = {
-        "Gender": mapping["Gender"][form_data["Gender"]],
-        "Married": mapping["Married"][form_data["Married"]],
-        "Dependents": mapping["Dependents"][form_data["Dependents"]],
-        "Education": mapping["Education"][form_data["Education"]],
-        "Self_Employed": mapping["Self_Employed"][form_data["Self_Employed"]],
-        "ApplicantIncome": form_data["ApplicantIncome"],
-        "CoapplicantIncome": form_data["CoapplicantIncome"],
-        "LoanAmount": form_data["LoanAmount"],
-        "Loan_Amount_Term": form_data["Loan_Amount_Term"],
-        "Credit_History": 1 if form_data["Credit_History"] == "Good (1)" else 0,
-        "Property_Area": mapping["Property_Area"][form_data["Property_Area"]],
-    }
-    return pd.DataFrame([row])
+@st.cache_resource(max_entries=1)
+def get_model(path: str, flat_dir: str, service_url: str, fingerprint: tuple):
+    # Thin client of loan_service.py when configured; otherwise score in-process.
+    # The flat export is memory-mapped, so worker processes share one copy of the trees.
+    # `fingerprint` changes when the model files are rewritten, which drops the old
+    # model together with its prediction cache.
+    if service_url:
+        return PredictionCache(LoanServiceClient(service_url), CACHE_SIZE)
+    return PredictionCache(load_model(path, flat_dir), CACHE_SIZE)
 
 def predict_label(y):
-    return "✅ Loan Approved" if int(y) == 1 else "❌ Loan Rejected"
+    return APPROVED if int(y) == 1 else REJECTED
+
+def upload_digest(uploaded) -> str:
+    """sha256 of an upload's bytes, hashed once per uploaded file rather than on every rerun."""
+    digests = st.session_state.setdefault("upload_digests", {})
+    if uploaded.file_id not in digests:
+        digests[uploaded.file_id] = hashlib.sha256(uploaded.getvalue()).hexdigest()
+    return digests[uploaded.file_id]
+
+# Keyed on (upload digest, model identity); the leading-underscore arguments are not hashed.
+@st.cache_data(max_entries=8, ttl=3600, show_spinner="Scoring applicants...")
+def score_upload(digest: str, model_key: tuple, _data: bytes, _model) -> np.ndarray:
+    """Predictions for every row of an upload, encoded and scored CHUNK_ROWS at a time."""
+    preds = [_model.predict(prepare_frame(chunk)) for chunk in pd.read_csv(io.BytesIO(_data), chunksize=CHUNK_ROWS)]
+    return np.concatenate(preds) if preds else np.empty(0, dtype=int)
+
+@st.cache_data(max_entries=2, ttl=3600, show_spinner="Building results CSV...")
+def results_csv(digest: str, model_key: tuple, _data: bytes, _preds: np.ndarray) -> bytes:
+    """The upload with a Prediction column, as CSV bytes (only built when a download is requested)."""
+    out = io.BytesIO()
+    offset = 0
+    for chunk in pd.read_csv(io.BytesIO(_data), chunksize=CHUNK_ROWS):
+        chunk["Prediction"] = predict_labels(_preds[offset:offset + len(chunk)])
+        chunk.to_csv(out, header=(offset == 0), index=False, encoding="utf-8")
+        offset += len(chunk)
+    return out.getvalue()
+
+def result_page(data: bytes, preds: np.ndarray, page: int) -> pd.DataFrame:
+    """One PAGE_ROWS slice of the upload with its predictions; only this slice is sent to the browser."""
+    start = page * PAGE_ROWS
+    frame = pd.read_csv(io.BytesIO(data), skiprows=range(1, start + 1), nrows=PAGE_ROWS)
+    frame["Prediction"] = predict_labels(preds[start:start + len(frame)])
+    frame.index = pd.RangeIndex(start, start + len(frame))
+    return frame
+
+def sweep_axis(name: str, lo: float, hi: float, points: int) -> np.ndarray:
+    if name == "Loan_Amount_Term":
+        return np.array([t for t in LOAN_TERMS if lo <= t <= hi])
+    return np.unique(np.linspace(lo, hi, points).round())
+
+def sweep_chart(grid: pd.DataFrame, prob: np.ndarray, applicant: dict) -> alt.Chart:
+    """P(approved) along one swept feature (line, applicant's value marked), or over two (heatmap)."""
+    data = grid.assign(P_approved=prob, Decision=np.where(prob >= 0.5, "Approved", "Rejected"))
+    x = grid.columns[0]
+    if len(grid.columns) == 1:
+        here = pd.DataFrame([{x: applicant[x]}])
+        line = alt.Chart(data).mark_line(point=True).encode(
+            x=alt.X(f"{x}:Q"), y=alt.Y("P_approved:Q", scale=alt.Scale(domain=[0, 1])),
+            color="Decision:N", tooltip=[x, "P_approved", "Decision"])
+        threshold = alt.Chart(pd.DataFrame({"y": [0.5]})).mark_rule(strokeDash=[4, 4]).encode(y="y:Q")
+        current = alt.Chart(here).mark_rule(color="black").encode(x=f"{x}:Q")
+        return line + threshold + current
+    y = grid.columns[1]
+    heat = alt.Chart(data).mark_rect().encode(
+        x=alt.X(f"{x}:O", axis=alt.Axis(labelOverlap=True)), y=alt.Y(f"{y}:O", sort="descending",
+                                                                        axis=alt.Axis(labelOverlap=True)),
+        color=alt.Color("P_approved:Q", scale=alt.Scale(scheme="redyellowgreen", domain=[0, 1])),
+        tooltip=[x, y, "P_approved", "Decision"])
+    return heat
 
 # ----------------------------
 # Load model
 # ----------------------------
 MODEL_PATH = "loan_model.pkl"   # Make sure loan_model.pkl is in same folder
+FLAT_MODEL_DIR = "loan_model_flat"  # preferred when present (written by train_loan_model.py)
+SERVICE_URL = os.environ.get("LOAN_SERVICE_URL", "")  # e.g. http://127.0.0.1:8000 to score via loan_service.py
+CACHE_SIZE = 50_000             # distinct applicants kept in the prediction LRU
+CHUNK_ROWS = 20_000             # batch uploads are read, encoded and scored this many rows at a time
+PAGE_ROWS = 500                 # rows per page of the results table (the download has all of them)
+LOAN_TERMS = [12, 36, 60, 84, 120, 180, 240, 300, 360]
+# What-if sweep bounds per numeric feature (Loan_Amount_Term sweeps the LOAN_TERMS options)
+SWEEP_RANGES = {"ApplicantIncome": (0, 30_000), "CoapplicantIncome": (0, 15_000), "LoanAmount": (0, 800),
+                "Loan_Amount_Term": (12, 360)}
+MODEL_KEY = (SERVICE_URL, model_fingerprint(MODEL_PATH, FLAT_MODEL_DIR))  # batch results are cached per model
 try:
-    model = load_model(MODEL_PATH)
-    st.success(f"Model loaded: {MODEL_PATH}")
+    model = get_model(MODEL_PATH, FLAT_MODEL_DIR, SERVICE_URL, MODEL_KEY[1])
+    if SERVICE_URL:
+        model.model.health()
+        st.success(f"Prediction service: {SERVICE_URL}")
+    else:
+        st.success(f"Model loaded: {FLAT_MODEL_DIR if isinstance(model.model, FlatForestModel) else MODEL_PATH}")
 except Exception as e:
-    st.error(f"Could not load model at '{MODEL_PATH}'. Place loan_model.pkl in this folder. Error: {e}")
+    if SERVICE_URL:
+        st.error(f"Could not reach the prediction service at '{SERVICE_URL}'. Error: {e}")
+    else:
+        st.error(f"Could not load model at '{MODEL_PATH}'. Place loan_model.pkl in this folder. Error: {e}")
     st.stop()
 
 # ----------------------------
@@ -74,13 +140,13 @@ with tab_single:
             coapplicant_income = st.number_input("Coapplicant Income", min_value=0, value=0, step=100)
             loan_amount = st.number_input("Loan Amount (thousands)", min_value=0, value=150, step=10)
         with col3:
-            loan_term = st.selectbox("Loan Term (months)", [12, 36, 60, 84, 120, 180, 240, 300, 360], index=8)
+            loan_term = st.selectbox("Loan Term (months)", LOAN_TERMS, index=8)
             credit_hist = st.selectbox("Credit History", ["Good (1)", "Bad (0)"], index=0)
             property_area = st.selectbox("Property Area", ["Urban", "Semiurban", "Rural"], index=0)
 
         submitted = st.form_submit_button("Predict")
         if submitted:
-            features = encode_inputs({
+            st.session_state["applicant"] = {
                 "Gender": gender,
                 "Married": married,
                 "Dependents": dependents,
@@ -92,59 +158,65 @@ with tab_single:
                 "Loan_Amount_Term": loan_term,
                 "Credit_History": credit_hist,
                 "Property_Area": property_area,
-            })
-            y_pred = model.predict(features)[0]
+            }
+            y_pred = model.predict(encode_inputs(st.session_state["applicant"]))[0]
             st.markdown(f"### Result: **{predict_label(y_pred)}**")
 
+    # What-if: vary one or two numeric features around the last submitted applicant
+    applicant = st.session_state.get("applicant")
+    if applicant is not None:
+        with st.expander("What-if sweep", expanded=False):
+            swept = st.multiselect("Features to vary (up to 2)", NUMERIC_COLUMNS, default=["LoanAmount"],
+                                   max_selections=2)
+            points = st.slider("Points per feature", 10, 200, 100 if len(swept) < 2 else 50)
+            axes = {}
+            for name in swept:
+                lo, hi = SWEEP_RANGES[name]
+                lo, hi = st.slider(f"{name} range", lo, hi, (lo, hi))
+                axes[name] = sweep_axis(name, lo, hi, points)
+            if axes and all(len(v) for v in axes.values()):
+                grid, X = sweep_inputs(applicant, axes)
+                t0 = time.perf_counter()
+                # Straight to the model: one vectorized call, without filling the prediction LRU with grid rows
+                prob = approval_probability(model.model, X)
+                st.caption(f"Scored {len(grid):,} scenarios in {(time.perf_counter() - t0) * 1000:.0f} ms")
+                st.altair_chart(sweep_chart(grid, prob, applicant), use_container_width=True)
+                if len(swept) == 1:
+                    flips = grid[swept[0]][np.diff(prob >= 0.5, prepend=prob[0] >= 0.5)]
+                    if len(flips):
+                        st.write(f"Decision changes at {swept[0]} ≈ " + ", ".join(f"{v:,.0f}" for v in flips))
+                    else:
+                        st.write(f"Decision does not change across this {swept[0]} range.")
+
 with tab_batch:
     st.subheader("Batch Predictions via CSV")
     st.write("Upload a CSV with the following columns (case-sensitive):")
     st.code("Gender,Married,Dependents,Education,Self_Employed,ApplicantIncome,CoapplicantIncome,LoanAmount,Loan_Amount_Term,Credit_History,Property_Area", language="text")
     uploaded = st.file_uploader("Upload applicants CSV", type=["csv"])
     if uploaded:
-        df = pd.read_csv(uploaded)
-        required_cols = ["Gender","Married","Dependents","Education","Self_Employed",
-                         "ApplicantIncome","CoapplicantIncome","LoanAmount","Loan_Amount_Term",
-                         "Credit_History","Property_Area"]
-        if not all(c in df.columns for c in required_cols):
+        header = pd.read_csv(uploaded, nrows=0)
+        uploaded.seek(0)
+        if not all(c in header.columns for c in FEATURE_COLUMNS):
             st.error("CSV is missing one or more required columns listed above.")
         else:
-            def normalize_row(r):
-                mapping = {
-                    "Gender": {"Female": 0, "Male": 1},
-                    "Married": {"No": 0, "Yes": 1},
-                    "Dependents": {"0": 0, "1": 1, "2": 2, "3+": 3},
-                    "Education": {"Graduate": 0, "Not Graduate": 1},
-                    "Self_Employed": {"No": 0, "Yes": 1},
-                    "Property_Area": {"Rural": 0, "Semiurban": 1, "Urban": 2},
-                }
-                out = {}
-                for k in required_cols:
-                    v = r[k]
-                    if k in mapping:
-                        if isinstance(v, str) and v in mapping[k]:
-                            out[k] = mapping[k][v]
-                        else:
-                            out[k] = int(v)
-                    elif k == "Credit_History":
-                        if isinstance(v, str):
-                            out[k] = 1 if v.strip() in ["1", "1.0", "Good (1)", "good", "Good"] else 0
-                        else:
-                            out[k] = int(v)
-                    else:
-                        out[k] = v
-                return out
-
-            encoded = pd.DataFrame([normalize_row(r) for _, r in df.iterrows()])
-            preds = model.predict(encoded)
-            labels = ["✅ Loan Approved" if p == 1 else "❌ Loan Rejected" for p in preds]
-            result = df.copy()
-            result["Prediction"] = labels
-            st.dataframe(result, use_container_width=True)
-
-            # Offer CSV download
-            csv_bytes = result.to_csv(index=False).encode("utf-8")
-            st.download_button("Download results CSV", data=csv_bytes,
-                               file_name="loan_predictions.csv", mime="text/csv")
-
-st.caption("Note: Category encodings mirror the training pipeline (LabelEncoder with sorted categories).")
+            # Scored once per (file, model); other widget interactions rerun against the cached predictions
+            digest = upload_digest(uploaded)
+            data = uploaded.getvalue()
+            preds = score_upload(digest, MODEL_KEY, data, model)
+            total = len(preds)
+            approved = int((np.asarray(preds) == 1).sum())
+            st.write(f"Scored {total:,} rows · {approved:,} approved · {total - approved:,} rejected")
+
+            pages = max(1, -(-total // PAGE_ROWS))
+            page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1) - 1
+            st.dataframe(result_page(data, preds, page), use_container_width=True)
+
+            # CSV bytes are only built (then cached) once a download is requested
+            if st.checkbox("Prepare results CSV for download"):
+                st.download_button("Download results CSV", data=results_csv(digest, MODEL_KEY, data, preds),
+                                   file_name="loan_predictions.csv", mime="text/csv")
+
+cache = model.stats()
+st.sidebar.caption(f"Prediction cache: {cache['hits']:,} hits · {cache['misses']:,} misses · "
+                   f"{cache['deduped']:,} duplicate rows · {cache['size']:,}/{cache['maxsize']:,} entries")
+st.caption("Note: Imputation and category encoding are part of the trained pipeline in loan_model.pkl.")
@@ -0,0 +1,282 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+
+from loan_features import FEATURE_COLUMNS, NUMERIC_COLUMNS, GOOD_CREDIT, encode_inputs
+
+# loan_service.py
+# Standalone prediction endpoint for the loan model (plain asyncio HTTP/1.1, no
+# framework). Concurrent requests are micro-batched into one predict_proba call.
+#
+#   python loan_service.py --port 8000 --max-batch 256 --max-wait-ms 5
+#
+#   POST /predict  {"applicants": [{"Gender": "Male", ...}, ...]}   friendly form values
+#                  {"rows": [["Male", "Yes", "0", ...], ...]}         raw FEATURE_COLUMNS rows
+#   -> {"classes": [0, 1], "proba": [[p0, p1], ...], "predictions": [1, ...]}
+#   GET  /health
+
+MODEL_PATH = "loan_model.pkl"
+FLAT_MODEL_DIR = "loan_model_flat"
+MAX_BATCH = 256      # rows per predict_proba call
+MAX_WAIT_MS = 5.0    # how long the first queued request waits for others to join its batch
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class MicroBatcher:
+    """Collects rows from concurrent callers and scores them together."""
+
+    def __init__(self, model, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue: "asyncio.Queue[Tuple[list, asyncio.Future]]" = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batches = 0
+        self.rows = 0
+
+    async def predict_proba(self, rows: list) -> np.ndarray:
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, fut))
+        return await fut
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            rows = np.array([r for item_rows, _ in pending for r in item_rows], dtype=object)
+            try:
+                proba = await loop.run_in_executor(self.executor, self.model.predict_proba, rows)
+            except Exception as e:
+                if len(pending) == 1:
+                    self._fail(pending, e)
+                    continue
+                # Re-score each request on its own so one bad request does not fail its batch-mates
+                for item in pending:
+                    await self._score_alone(loop, item)
+                continue
+            self.batches += 1
+            self.rows += len(rows)
+            start = 0
+            for item_rows, fut in pending:
+                if not fut.done():
+                    fut.set_result(proba[start:start + len(item_rows)])
+                start += len(item_rows)
+
+    async def _score_alone(self, loop, item):
+        item_rows, fut = item
+        try:
+            proba = await loop.run_in_executor(self.executor, self.model.predict_proba,
+                                               np.array(item_rows, dtype=object))
+        except Exception as e:
+            self._fail([item], e)
+            return
+        self.batches += 1
+        self.rows += len(item_rows)
+        if not fut.done():
+            fut.set_result(proba)
+
+    @staticmethod
+    def _fail(pending, e: Exception):
+        for _, fut in pending:
+            if not fut.done():
+                fut.set_exception(e)
+
+
+NUMERIC_POSITIONS = [FEATURE_COLUMNS.index(c) for c in NUMERIC_COLUMNS]
+CREDIT_POSITION = FEATURE_COLUMNS.index("Credit_History")
+
+
+def _as_number(value, column: str, row: int) -> float:
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return math.nan
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"row {row}: {column} must be a number, got {value!r}") from None
+    if math.isinf(number):
+        raise ValueError(f"row {row}: {column} must be finite, got {value!r}")
+    return number
+
+
+def _coerce_row(values, row: int) -> list:
+    """Numeric columns as floats (missing = NaN), Credit_History as 0/1; ValueError names the bad field."""
+    if len(values) != len(FEATURE_COLUMNS):
+        raise ValueError(f"each row needs {len(FEATURE_COLUMNS)} values: {FEATURE_COLUMNS}")
+    out = [math.nan if v is None else v for v in values]
+    for i in NUMERIC_POSITIONS:
+        out[i] = _as_number(values[i], FEATURE_COLUMNS[i], row)
+    credit = values[CREDIT_POSITION]
+    if isinstance(credit, str) and credit.strip():
+        out[CREDIT_POSITION] = 1.0 if credit.strip() in GOOD_CREDIT else 0.0  # same rule as encode_inputs
+    else:
+        out[CREDIT_POSITION] = _as_number(credit, "Credit_History", row)
+    return out
+
+
+def rows_from_payload(payload: dict) -> list:
+    """Raw model rows from either friendly applicant dicts or positional rows (null = missing).
+
+    Raises ValueError (a 400 for the caller) for malformed input, so it never reaches a shared batch.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError('body must be a JSON object with "applicants" or "rows"')
+    if "applicants" in payload:
+        applicants = payload["applicants"]
+        if not isinstance(applicants, list) or not all(isinstance(a, dict) for a in applicants):
+            raise ValueError('"applicants" must be a list of objects')
+        rows = [list(encode_inputs(a)[0]) for a in applicants]
+    else:
+        rows = payload.get("rows", [])
+        if not isinstance(rows, list) or not all(isinstance(r, list) for r in rows):
+            raise ValueError('"rows" must be a list of arrays')
+    return [_coerce_row(r, i) for i, r in enumerate(rows)]
+
+
+class LoanService:
+    def __init__(self, model, batcher: MicroBatcher):
+        self.model = model
+        self.batcher = batcher
+        self.classes = [c.item() if hasattr(c, "item") else c for c in model.classes_]
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "batches": self.batcher.batches, "rows": self.batcher.rows}
+        if method != "POST" or path != "/predict":
+            return 404, {"error": f"no route for {method} {path}"}
+        try:
+            rows = rows_from_payload(json.loads(body or b"{}"))
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {"error": str(e)}
+        if not rows:
+            return 200, {"classes": self.classes, "proba": [], "predictions": []}
+        try:
+            proba = await self.batcher.predict_proba(rows)
+        except Exception as e:
+            return 500, {"error": f"prediction failed: {e}"}
+        predictions = [self.classes[i] for i in np.argmax(proba, axis=1)]
+        return 200, {"classes": self.classes, "proba": proba.tolist(), "predictions": predictions}
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.handle(method, path.split("?", 1)[0], body)
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+class LoanServiceClient:
+    """Model-like client (predict / predict_proba / classes_) for a running loan_service."""
+
+    def __init__(self, url: str, timeout: float = 60):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.classes_: Optional[np.ndarray] = None
+
+    def health(self) -> dict:
+        with urllib.request.urlopen(f"{self.url}/health", timeout=self.timeout) as resp:
+            return json.loads(resp.read())
+
+    def predict_proba(self, X) -> np.ndarray:
+        rows = [[None if isinstance(v, float) and math.isnan(v) else (v.item() if hasattr(v, "item") else v)
+                 for v in row] for row in X]
+        req = urllib.request.Request(f"{self.url}/predict", data=json.dumps({"rows": rows}).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            result = json.loads(resp.read())
+        self.classes_ = np.asarray(result["classes"])
+        return np.asarray(result["proba"], dtype=np.float64).reshape(len(rows), len(self.classes_))
+
+    def predict(self, X) -> np.ndarray:
+        proba = self.predict_proba(X)
+        return self.classes_[np.argmax(proba, axis=1)]
+
+
+async def serve(host: str, port: int, model, max_batch: int, max_wait_ms: float):
+    batcher = MicroBatcher(model, max_batch, max_wait_ms)
+    service = LoanService(model, batcher)
+    batch_task = asyncio.create_task(batcher.run())
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    print(f"🚀 Loan prediction service on http://{host}:{port} (max batch {max_batch}, max wait {max_wait_ms} ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batch_task.cancel()
+
+
+def main():
+    from flat_forest import load_model
+
+    parser = argparse.ArgumentParser(description="Micro-batching HTTP prediction service for the loan model.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--flat-dir", default=FLAT_MODEL_DIR)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    model = load_model(args.model, args.flat_dir)
+    print(f"✅ Model loaded in {time.perf_counter() - t0:.2f}s")
+    try:
+        asyncio.run(serve(args.host, args.port, model, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Union
+
+if TYPE_CHECKING:  # pandas is only needed by callers that pass a Series
+    import pandas as pd
+
+# location_rules.py
+# One set of US / not-New-York location rules shared by all scrapers.
+# The tables are compiled once into an inclusion and an exclusion regex, so
+# classifying a location is two C-level searches instead of a Python loop over
+# every state and token; batches classify each distinct location only once.
+
+# ====== RULE TABLES ======
+US_MARKERS = ["united states", "u.s.", "usa"]
+US_STATE_ABBR = {
+    "AL","AK","AZ","AR","CA","CO","CT","DC","DE","FL","GA","HI","IA","ID","IL","IN","KS","KY","LA","MA","MD",
+    "ME","MI","MN","MO","MS","MT","NC","ND","NE","NH","NJ","NM","NV","OH","OK","OR","PA","RI","SC","SD","TN",
+    "TX","UT","VA","VT","WA","WI","WV","WY","PR","GU","VI"
+}
+US_STATE_FULL = {
+    "alabama","alaska","arizona","arkansas","california","colorado","connecticut","delaware","florida","georgia",
+    "hawaii","idaho","illinois","indiana","iowa","kansas","kentucky","louisiana","maine","maryland","massachusetts",
+    "michigan","minnesota","mississippi","missouri","montana","nebraska","nevada","new hampshire","new jersey",
+    "new mexico","north carolina","north dakota","ohio","oklahoma","oregon","pennsylvania","rhode island",
+    "south carolina","south dakota","tennessee","texas","utah","vermont","virginia","washington","west virginia",
+    "wisconsin","wyoming","district of columbia","washington, d.c.","washington dc","d.c.","dc"
+}
+US_CITIES = {"los angeles", "san francisco", "boston", "chicago"}
+EXCLUDE_TERMS = {"new york", "ny", "nyc"}  # exclude NY by text
+# =========================
+
+
+def _alternation(terms: Iterable[str]) -> str:
+    # Longest first so "washington, d.c." wins over "washington"
+    return "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+
+
+class LocationClassifier:
+    """Compiled location filter: accepts US locations, rejects any excluded term.
+
+    Terms match as whole words (so "usa" does not fire inside "busan"). A trailing
+    ", XX" state abbreviation also counts as US. Exclusions always win.
+    """
+
+    def __init__(self, us_terms: Iterable[str], state_abbr: Iterable[str], exclude_terms: Iterable[str]):
+        abbr = _alternation(a.lower() for a in state_abbr if a.lower() not in set(exclude_terms))
+        # Two searches with no leading ".*" (each string is scanned once per pattern). Word edges are
+        # spelled "(?:^|[^a-z])" rather than lookbehinds so pandas/Arrow can run them natively (RE2).
+        self.include = re.compile(rf"(?:^|[^a-z])(?:{_alternation(us_terms)})(?:[^a-z]|$)|,\s*(?:{abbr})\s*$")
+        self.exclude = re.compile(rf"(?:^|[^a-z])(?:{_alternation(exclude_terms)})(?:[^a-z]|$)")
+
+    def __call__(self, location: str) -> bool:
+        if not location:
+            return False
+        text = location.lower()
+        return self.include.search(text) is not None and self.exclude.search(text) is None
+
+    def classify(self, locations: Union[Iterable[str], "pd.Series"]) -> Union[List[bool], "pd.Series"]:
+        """Vectorized verdicts for a batch: a pandas Series in, boolean Series out; any other iterable gives a list.
+
+        Scraped locations repeat heavily, so each distinct value is classified once and mapped back.
+        """
+        if hasattr(locations, "str"):
+            import numpy as np
+            import pandas as pd
+
+            codes, uniques = locations.factorize()  # missing values get code -1
+            texts = pd.Series(uniques).astype(str).str.lower()
+            verdicts = texts.str.contains(self.include.pattern) & ~texts.str.contains(self.exclude.pattern)
+            return pd.Series(np.append(verdicts.to_numpy(dtype=bool), False)[codes], index=locations.index,
+                             name=locations.name)
+        known: Dict[str, bool] = {}
+        out = []
+        for loc in locations:
+            verdict = known.get(loc)
+            if verdict is None:
+                verdict = known[loc] = bool(loc) and self(loc)
+            out.append(verdict)
+        return out
+
+
+US_NOT_NY = LocationClassifier(US_MARKERS + sorted(US_STATE_FULL) + sorted(US_CITIES), US_STATE_ABBR, EXCLUDE_TERMS)
+
+
+def is_us_location(location: str) -> bool:
+    """True for a US location outside New York."""
+    return US_NOT_NY(location)
+
+
+def classify_locations(locations: Union[Iterable[str], "pd.Series"]) -> Union[List[bool], "pd.Series"]:
+    """Batch form of is_us_location: a boolean Series for a pandas Series, else a list."""
+    return US_NOT_NY.classify(locations)
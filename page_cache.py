@@ -0,0 +1,141 @@
+import re
+import gzip
+import time
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Callable, Optional
+
+# page_cache.py
+# Shared on-disk cache of fetched LinkedIn pages for all three scrapers. Pages
+# are keyed by normalized URL and point at gzip blobs addressed by the sha256
+# of the HTML, so identical pages are stored once. `fetch` returns a fresh
+# cached copy or loads through the browser; in replay mode it never loads.
+# Login walls, checkpoints and pages failing the caller's `valid` check are
+# returned but never stored, so one bad fetch cannot poison later runs.
+
+CACHE_PATH = "page_cache.sqlite"
+TTL_HOURS = 24  # cached pages younger than this are reused instead of refetched
+
+# Query parameters that change per visit but not the page content
+TRACKING_PARAMS = {"trk", "trackingId", "lipi", "miniProfileUrn", "origin", "sid", "lici"}
+
+# Served instead of the requested page when the session is signed out or challenged
+LOGGED_OUT_TITLES = ("login", "log in", "sign in", "sign up", "join linkedin", "security verification")
+LOGGED_OUT_URLS = ("/authwall", "/checkpoint/", "/uas/login", "/login")
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+PAGE_URL_RE = re.compile(r'<(?:link[^>]+rel="canonical"|meta[^>]+property="og:url")[^>]*>', re.IGNORECASE)
+
+
+def normalize_url(url: str) -> str:
+    """Cache key: lowercase host, no fragment/tracking params, sorted query, no trailing slash.
+
+    Profile URLs (/in/...) drop the query entirely, like the scrapers' split("?").
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    if "/in/" in path:
+        query = ""
+    else:
+        params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in TRACKING_PARAMS]
+        query = urlencode(sorted(params))
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), path, query, ""))
+
+
+def looks_logged_out(page_html: str) -> bool:
+    """True for login walls, authwall/checkpoint redirects and sign-up pages (judged by title and canonical URL)."""
+    head = page_html[:50_000]
+    title = TITLE_RE.search(head)
+    if title and any(t in title.group(1).lower() for t in LOGGED_OUT_TITLES):
+        return True
+    return any(m in tag for tag in PAGE_URL_RE.findall(head) for m in LOGGED_OUT_URLS)
+
+
+class PageCache:
+    def __init__(self, path: str = CACHE_PATH, ttl_hours: float = TTL_HOURS):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.lock = threading.Lock()  # profile pool workers write from their own threads
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0  # fetched pages not stored (logged out / failed the caller's check)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, html BLOB NOT NULL)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url_key TEXT PRIMARY KEY, url TEXT NOT NULL, hash TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, url: str, ignore_ttl: bool = False) -> Optional[str]:
+        """Cached HTML for `url`, or None when missing (or older than the TTL unless `ignore_ttl`)."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT b.html, p.fetched_at FROM pages p JOIN blobs b ON b.hash = p.hash WHERE p.url_key = ?",
+                (normalize_url(url),),
+            ).fetchone()
+            if row is None or (not ignore_ttl and time.time() - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return gzip.decompress(row[0]).decode("utf-8")
+
+    def put(self, url: str, page_html: str) -> bool:
+        """Store a fetched page; login walls and checkpoints are refused (returns False)."""
+        if not page_html:
+            return False
+        if looks_logged_out(page_html):
+            with self.lock:
+                self.rejected += 1
+            return False
+        data = page_html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob = gzip.compress(data, compresslevel=6)
+        with self.lock:
+            self.conn.execute("INSERT OR IGNORE INTO blobs (hash, html) VALUES (?, ?)", (digest, blob))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url_key, url, hash, fetched_at) VALUES (?, ?, ?, ?)",
+                (normalize_url(url), url, digest, time.time()),
+            )
+            self.conn.commit()
+        return True
+
+    def fetch(self, url: str, load: Callable[[], str], replay: bool = False,
+              valid: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """Cached HTML if fresh (any age in replay mode); otherwise `load()` it and store it when it
+        passes `valid` (e.g. "has result cards"). A rejected page is still returned for this run.
+
+        Returns None only in replay mode when the page was never cached.
+        """
+        page_html = self.get(url, ignore_ttl=replay)
+        if page_html is not None or replay:
+            return page_html
+        page_html = load()
+        if valid is not None and page_html and not valid(page_html):
+            with self.lock:
+                self.rejected += 1
+        else:
+            self.put(url, page_html)
+        return page_html
+
+    def prune(self, older_than_hours: float) -> int:
+        """Drop pages fetched more than `older_than_hours` ago and blobs nothing points at."""
+        cutoff = time.time() - older_than_hours * 3600
+        with self.lock:
+            removed = self.conn.execute("DELETE FROM pages WHERE fetched_at < ?", (cutoff,)).rowcount
+            self.conn.execute("DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM pages)")
+            self.conn.commit()
+        return removed
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
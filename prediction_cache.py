@@ -0,0 +1,105 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# prediction_cache.py
+# Bounded LRU of class probabilities keyed on the raw feature row. Wraps any
+# model with predict_proba/classes_; duplicate rows inside a batch are scored
+# once and scattered back.
+
+
+def model_fingerprint(*paths: str) -> Tuple:
+    """(path, mtime_ns, size) for each existing model file; changes whenever the model is rewritten."""
+    out = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, f) for f in os.listdir(path))
+        else:
+            files = [path]
+        for f in files:
+            if os.path.exists(f):
+                st = os.stat(f)
+                out.append((f, st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def row_keys(X) -> list:
+    """Hashable key per row; missing values become None so they compare equal."""
+    rows = np.array(X, dtype=object, copy=True)
+    rows[pd.isna(rows)] = None
+    return list(map(tuple, rows.tolist()))
+
+
+class PredictionCache:
+    """LRU front for `model.predict_proba` with hit/miss counters."""
+
+    def __init__(self, model, maxsize: int = 10_000):
+        self.model = model
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.deduped = 0  # rows answered by an identical row in the same batch
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+    def predict_proba(self, X) -> np.ndarray:
+        rows = np.asarray(X, dtype=object)
+        if len(rows) == 0:
+            return self.model.predict_proba(rows)
+        keys = row_keys(rows)
+
+        # Dedupe: each row points at the slot of the first row with the same key
+        slot_of = {}
+        firsts = []
+        slots = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            slot = slot_of.get(key)
+            if slot is None:
+                slot = slot_of[key] = len(firsts)
+                firsts.append(i)
+            slots[i] = slot
+        unique_keys = list(slot_of)
+        unique_rows = rows[firsts]
+
+        results = [None] * len(unique_keys)
+        missing = []
+        with self.lock:
+            for j, key in enumerate(unique_keys):
+                hit = self.entries.get(key)
+                if hit is None:
+                    missing.append(j)
+                else:
+                    self.entries.move_to_end(key)
+                    results[j] = hit
+            self.hits += len(unique_keys) - len(missing)
+            self.misses += len(missing)
+            self.deduped += len(keys) - len(unique_keys)
+
+        if missing:
+            proba = self.model.predict_proba(unique_rows[missing])
+            with self.lock:
+                for j, p in zip(missing, np.array(proba, dtype=np.float64)):
+                    results[j] = p
+                    self.entries[unique_keys[j]] = p.copy()
+                    self.entries.move_to_end(unique_keys[j])
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+
+        return np.vstack(results)[slots]
+
+    def predict(self, X) -> np.ndarray:
+        return np.asarray(self.classes_)[np.argmax(self.predict_proba(X), axis=1)]
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "deduped": self.deduped,
+                    "size": len(self.entries), "maxsize": self.maxsize}
+
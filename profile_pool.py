@@ -0,0 +1,206 @@
+import sys
+import os
+import queue
+import threading
+import time
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+# profile_pool.py
+# Profile top-card scraping with explicit waits, and a bounded pool of browser
+# sessions that enriches queued profile URLs in parallel under one global rate
+# limit and open budget.
+
+# Top-card selector fallbacks (first match of the first selector with text wins)
+NAME_SELECTORS = [
+    (By.CSS_SELECTOR, "h1"),
+    (By.CSS_SELECTOR, "div.ph5 h1"),
+    (By.CSS_SELECTOR, "[data-test-profile-card-headline] h1"),
+]
+HEADLINE_SELECTORS = [
+    (By.CSS_SELECTOR, "div.text-body-medium.break-words"),
+    (By.CSS_SELECTOR, "div.text-body-medium"),
+    (By.XPATH, "//div[contains(@class,'pv-text-details__left-panel')]/div[1]"),
+]
+LOCATION_SELECTORS = [
+    (By.CSS_SELECTOR, "span.text-body-small.inline.t-black--light.break-words"),
+    (By.XPATH, "//span[contains(@class,'text-body-small') and contains(.,',')]"),
+    (By.XPATH, "//div[contains(@class,'pv-text-details__left-panel')]//span[contains(@class,'text-body-small')]"),
+]
+
+PROFILE_WAIT_SEC = 12  # wait for the name to render
+FIELD_WAIT_SEC = 3     # extra wait for headline/location once the name is there
+
+
+def first_text(driver, selectors) -> str:
+    for sel in selectors:
+        found = driver.find_elements(*sel)
+        t = (found[0].text or "").strip() if found else ""
+        if t:
+            return t
+    return ""
+
+
+def wait_text(driver, selectors, timeout: float) -> str:
+    """Poll the selector fallbacks until one yields text, instead of sleeping a fixed time."""
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.2).until(lambda d: first_text(d, selectors))
+    except TimeoutException:
+        return ""
+
+
+def scrape_top_card(driver) -> Tuple[str, str, str]:
+    """Name/headline/location from the profile page currently loaded in `driver`."""
+    name = wait_text(driver, NAME_SELECTORS, PROFILE_WAIT_SEC)
+    headline = wait_text(driver, HEADLINE_SELECTORS, FIELD_WAIT_SEC)
+    location = wait_text(driver, LOCATION_SELECTORS, FIELD_WAIT_SEC)
+    return name, headline, location
+
+
+class RateLimiter:
+    """Global budget of `max_calls`, spaced at least `min_interval` seconds apart across threads."""
+
+    def __init__(self, max_calls: int, min_interval: float):
+        self.max_calls = max_calls
+        self.min_interval = min_interval
+        self.calls = 0
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def try_reserve(self) -> bool:
+        """Claim one call from the budget; False once it is spent."""
+        with self.lock:
+            if self.calls >= self.max_calls:
+                return False
+            self.calls += 1
+            return True
+
+    def wait_turn(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_at)
+            self.next_at = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class ProfileEnrichmentPool:
+    """N independent browser sessions fed from a queue of profile URLs.
+
+    `driver_factory()` builds one logged-in driver per worker. `submit` returns
+    False once `max_opens` profiles have been queued, so callers see the same cap
+    as a serial loop; `wait()` blocks until every queued URL has a result.
+    `page_sink(url, page_source)`, if given, receives each scraped page (e.g. PageCache.put).
+    """
+
+    def __init__(self, driver_factory: Callable, workers: int, max_opens: int, min_interval: float = 1.0,
+                 page_sink: Optional[Callable[[str, str], None]] = None):
+        self.driver_factory = driver_factory
+        self.page_sink = page_sink
+        self.limiter = RateLimiter(max_opens, min_interval)
+        self.tasks: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.results: Dict[str, Tuple[str, str, str]] = {}
+        self.results_lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(max(1, workers))]
+        for t in self.threads:
+            t.start()
+
+    @property
+    def opened(self) -> int:
+        return self.limiter.calls
+
+    def submit(self, url: str) -> bool:
+        if not self.limiter.try_reserve():
+            return False
+        self.tasks.put(url)
+        return True
+
+    def wait(self) -> Dict[str, Tuple[str, str, str]]:
+        self.tasks.join()
+        with self.results_lock:
+            return dict(self.results)
+
+    def close(self):
+        for _ in self.threads:
+            self.tasks.put(None)
+        for t in self.threads:
+            t.join()
+
+    def _worker(self):
+        driver = None
+        try:
+            while True:
+                url = self.tasks.get()
+                if url is None:
+                    self.tasks.task_done()
+                    break
+                result = ("", "", "")
+                try:
+                    if driver is None:
+                        driver = self.driver_factory()
+                    self.limiter.wait_turn()
+                    driver.get(url)
+                    result = scrape_top_card(driver)
+                    if self.page_sink is not None and any(result):  # never cache a page that did not render
+                        self.page_sink(url, driver.page_source)
+                except Exception as e:
+                    print(f"   ⚠️ Enrichment failed for {url}: {e}")
+                with self.results_lock:
+                    self.results[url] = result
+                self.tasks.task_done()
+        finally:
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+
+def serve_directory(path: str, port: int = 0) -> ThreadingHTTPServer:
+    """Serve saved profile HTML from `path` on localhost (for running the pool without LinkedIn)."""
+    handler = partial(SimpleHTTPRequestHandler, directory=path)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(args: List[str]):
+    """python profile_pool.py <dir of saved profile .html> [workers]"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    if not args:
+        print(main.__doc__)
+        return
+    folder = args[0]
+    workers = int(args[1]) if len(args) > 1 else 3
+
+    def headless_driver():
+        options = Options()
+        options.add_argument("--headless=new")
+        return webdriver.Chrome(options=options)
+
+    server = serve_directory(folder)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/{name}" for name in sorted(os.listdir(folder)) if name.endswith(".html")]
+
+    t0 = time.perf_counter()
+    pool = ProfileEnrichmentPool(headless_driver, workers, max_opens=len(urls), min_interval=0)
+    for url in urls:
+        pool.submit(url)
+    results = pool.wait()
+    pool.close()
+    server.shutdown()
+
+    for url in urls:
+        print(f"   • {url}: {results.get(url)}")
+    print(f"✅ Enriched {len(urls)} profiles with {workers} workers in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# run_metrics.py
+# Per-run instrumentation for the scrapers: `with metrics.stage("page_load"):`
+# timers, labelled counters (`metrics.incr("filter_rejects", reason="location")`)
+# and value histograms. At the end of a run `finish()` writes a JSON summary and,
+# optionally, a Prometheus textfile (node_exporter textfile collector format).
+# Thread-safe, so pool workers can record into the same run.
+
+METRICS_DIR = "run_metrics"
+PREFIX = "scraper"
+SECONDS_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram plus count/sum/max."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out, total = [], 0
+        for bound, n in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += n
+            out.append((str(bound), total))
+        return out
+
+
+def _key(labels: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_text(labels: Labels) -> str:
+    return ",".join(f"{k}={v}" for k, v in labels) or "total"
+
+
+def _prom_labels(labels: Labels) -> str:
+    def esc(v: str) -> str:
+        return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels) + "}"
+
+
+class RunMetrics:
+    """Timers, counters and histograms for one scraper run."""
+
+    def __init__(self, script: str, run_id: Optional[str] = None):
+        self.script = script
+        self.run_id = run_id or time.strftime("%Y%m%d_%H%M%S")
+        self.started_at = time.time()
+        self.t0 = time.perf_counter()
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, **labels):
+        """Time the block into the stage_seconds histogram (recorded even if it raises)."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - t0, stage=name, **labels)
+
+    def incr(self, name: str, n: float = 1, **labels):
+        key = (name, _key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = SECONDS_BUCKETS, **labels):
+        key = (name, _key(labels))
+        with self.lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    # -------------------------------
+    # Export
+    # -------------------------------
+    def summary(self) -> dict:
+        with self.lock:
+            stages = {}
+            histograms: Dict[str, dict] = {}
+            for (name, labels), h in sorted(self.histograms.items()):
+                entry = {"count": h.count, "total": round(h.sum, 3), "mean": round(h.sum / h.count, 3),
+                         "max": round(h.max, 3)}
+                if name == "stage_seconds":
+                    extra = tuple(kv for kv in labels if kv[0] != "stage")
+                    stage = dict(labels)["stage"]
+                    stages[f"{stage}[{_label_text(extra)}]" if extra else stage] = entry
+                else:
+                    histograms.setdefault(name, {})[_label_text(labels)] = entry
+            counters: Dict[str, dict] = {}
+            for (name, labels), value in sorted(self.counters.items()):
+                counters.setdefault(name, {})[_label_text(labels)] = value
+        return {
+            "script": self.script,
+            "run_id": self.run_id,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "wall_seconds": round(self.elapsed(), 3),
+            "stages": stages,
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def prometheus_text(self) -> str:
+        base = (("script", self.script),)
+        lines = []
+        with self.lock:
+            for name in sorted({n for n, _ in self.histograms}):
+                metric = f"{PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for (n, labels), h in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    labels = base + labels
+                    for le, total in h.cumulative():
+                        lines.append(f"{metric}_bucket{_prom_labels(labels + (('le', le),))} {total}")
+                    lines.append(f"{metric}_sum{_prom_labels(labels)} {h.sum:.6f}")
+                    lines.append(f"{metric}_count{_prom_labels(labels)} {h.count}")
+            for name in sorted({n for n, _ in self.counters}):
+                metric = f"{PREFIX}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (n, labels), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{metric}{_prom_labels(base + labels)} {value:g}")
+        lines.append(f"# TYPE {PREFIX}_run_seconds gauge")
+        lines.append(f"{PREFIX}_run_seconds{_prom_labels(base)} {self.elapsed():.3f}")
+        lines.append(f"# TYPE {PREFIX}_last_run_timestamp_seconds gauge")
+        lines.append(f"{PREFIX}_last_run_timestamp_seconds{_prom_labels(base)} {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def finish(self, metrics_dir: Optional[str] = METRICS_DIR, prom_textfile: Optional[str] = None) -> Optional[str]:
+        """Write the JSON summary (and the Prometheus textfile if a path is given); prints the slowest stages."""
+        summary = self.summary()
+        top = sorted(summary["stages"].items(), key=lambda kv: kv[1]["total"], reverse=True)[:5]
+        if top:
+            print("📊 Time by stage: " + ", ".join(f"{k} {v['total']:.1f}s/{v['count']}" for k, v in top))
+        path = None
+        if metrics_dir:
+            os.makedirs(metrics_dir, exist_ok=True)
+            path = os.path.join(metrics_dir, f"{self.script}_{self.run_id}.json")
+            _atomic_write(path, json.dumps(summary, indent=2, ensure_ascii=False))
+            print(f"📊 Run metrics saved to {path}")
+        if prom_textfile:
+            # The textfile collector may read at any moment: never expose a half-written file
+            _atomic_write(prom_textfile, self.prometheus_text())
+        return path
+
+
+def _atomic_write(path: str, text: str):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
@@ -0,0 +1,155 @@
+import os
+import sys
+import time
+import argparse
+from typing import List, Optional, Tuple
+
+try:
+    import tomllib  # Python 3.11+
+except ModuleNotFoundError:
+    tomllib = None
+
+from run_metrics import METRICS_DIR
+
+# scraper_cli.py
+# Command-line / config options shared by the three scrapers, so runs can be
+# scheduled (cron) without a terminal: page range from flags or a TOML file,
+# headless Chrome, and a persistent browser profile directory that keeps the
+# LinkedIn session between runs and batches. Chrome locks a profile to one
+# process, so each script defaults to its own (chrome_profile_<script>) and the
+# scrapers can run side by side.
+#
+#   scraper.toml
+#     [scraper]                       # every script
+#     headless = true
+#     [wfg_lead_db_fixed]             # one script (file name without .py)
+#     start_page = 1
+#     end_page = 40
+#     profile_dir = "chrome_profile_wfg"
+
+PROFILE_DIR = "chrome_profile"  # prefix; the default is PROFILE_DIR + "_<script>"
+LOGIN_WAIT_SEC = 15
+LOGGED_OUT_MARKERS = ("login", "checkpoint", "authwall", "signup")
+
+
+def script_name() -> str:
+    """File name of the running script without .py ("" when run interactively)."""
+    return os.path.splitext(os.path.basename(sys.argv[0]))[0]
+
+
+def default_profile_dir() -> str:
+    script = script_name()
+    return f"{PROFILE_DIR}_{script}" if script and not script.startswith("-") else PROFILE_DIR
+
+
+def profile_in_use(profile: str) -> bool:
+    """True when a live Chrome process holds `profile` (its SingletonLock points at "<host>-<pid>")."""
+    try:
+        target = os.readlink(os.path.join(profile, "SingletonLock"))
+    except OSError:
+        return False
+    try:
+        os.kill(int(target.rsplit("-", 1)[1]), 0)
+    except (IndexError, ValueError):
+        return True  # unknown lock format: assume it is held
+    except ProcessLookupError:
+        return False  # stale lock left by a crashed browser; Chrome clears it
+    except PermissionError:
+        return True
+    return True
+
+
+def add_common_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--config", help="TOML file with [scraper] and per-script defaults")
+    parser.add_argument("--start-page", type=int)
+    parser.add_argument("--end-page", type=int)
+    parser.add_argument("--headless", action="store_true", help="run Chrome without a window")
+    parser.add_argument("--profile-dir", default=default_profile_dir(),
+                        help="persistent Chrome user-data dir; keeps the login between runs ('' = fresh profile, "
+                             f"default {default_profile_dir()})")
+    parser.add_argument("--non-interactive", action="store_true",
+                        help="never prompt (implied when stdin is not a terminal)")
+    parser.add_argument("--metrics-dir", default=METRICS_DIR,
+                        help="directory for the per-run JSON timing/counter summary ('' = off)")
+    parser.add_argument("--prom-textfile", help="also write run metrics here for node_exporter's textfile collector")
+    parser.add_argument("--parquet-dir", help="also write leads as typed Parquet (one part file per run) under this "
+                                               "directory; the CSVs stay the resume log")
+
+
+def parse_args(parser: argparse.ArgumentParser, argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse flags, using values from --config as defaults; flags on the command line win."""
+    args = parser.parse_args(argv)
+    if args.config:
+        if tomllib is None:
+            parser.error("--config needs Python 3.11+ (tomllib)")
+        with open(args.config, "rb") as f:
+            config = tomllib.load(f)
+        defaults = {**config.get("scraper", {}), **config.get(script_name(), {})}
+        parser.set_defaults(**{k.replace("-", "_"): v for k, v in defaults.items()})
+        args = parser.parse_args(argv)
+    args.interactive = not args.non_interactive and sys.stdin.isatty()
+    return args
+
+
+def page_range(args: argparse.Namespace, parser: argparse.ArgumentParser, max_hint: str = "e.g., 5") -> Tuple[int, int]:
+    """Start/end page from flags or config; prompts only in an interactive session."""
+    start, end = args.start_page, args.end_page
+    if start is None or end is None:
+        if not args.interactive:
+            parser.error("--start-page and --end-page (or a --config) are required when not interactive")
+        if start is None:
+            start = int(input("Enter start page (e.g., 1): ").strip())
+        if end is None:
+            end = int(input(f"Enter end page ({max_hint}): ").strip())
+    return start, end
+
+
+def configure_chrome(options, args: argparse.Namespace, user_data_dir: Optional[str] = None):
+    """Apply headless/profile flags to a ChromeOptions (selenium or undetected_chromedriver)."""
+    if args.headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    else:
+        options.add_argument("--start-maximized")
+    profile = args.profile_dir if user_data_dir is None else user_data_dir
+    if profile:
+        if profile_in_use(profile):
+            raise SystemExit(f"❌ Chrome profile {profile} is in use by another browser (another scraper running?). "
+                             f"Pass a different --profile-dir or wait for that run to finish.")
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile)}")
+    return options
+
+
+def is_logged_in(driver) -> bool:
+    return not any(m in driver.current_url for m in LOGGED_OUT_MARKERS)
+
+
+def ensure_login(driver, args: argparse.Namespace, prompt: str) -> bool:
+    """Open the feed; a persisted profile is usually already signed in.
+
+    Otherwise waits for a manual login in interactive sessions and fails fast in
+    batch mode (sign in once interactively with the same --profile-dir).
+    """
+    driver.get("https://www.linkedin.com/feed/")
+    deadline = time.monotonic() + LOGIN_WAIT_SEC
+    while time.monotonic() < deadline and "feed" not in driver.current_url and is_logged_in(driver):
+        time.sleep(0.5)  # redirects still settling
+    if is_logged_in(driver):
+        print("✅ Logged in (saved browser profile)")
+        return True
+    if not args.interactive:
+        raise SystemExit(f"❌ Not logged in. Run once without --non-interactive using --profile-dir "
+                         f"{args.profile_dir or default_profile_dir()} and sign in; later runs reuse that session.")
+    driver.get("https://www.linkedin.com/login")
+    print("🔐 Log in manually in the browser window.")
+    input(prompt)
+    return is_logged_in(driver)
+
+
+def close_browser(driver, args: argparse.Namespace):
+    """Quit the browser; only holds it open for inspection in a visible, interactive session."""
+    if driver is None:
+        return
+    if args.interactive and not args.headless:
+        input("Press Enter to close the browser...")
+    driver.quit()
@@ -0,0 +1,103 @@
+import time
+import random
+from typing import NamedTuple, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+
+# scroll_control.py
+# Scroll a results page only as long as it keeps growing. A MutationObserver
+# marks the last DOM change; after each scroll we wait until the DOM has been
+# quiet for a moment (or a short timeout), then stop once the scroll height and
+# card count no longer change, or as soon as the target selector is present.
+
+POLL_SEC = 0.1
+
+# Installed once per document; records when the DOM last changed
+OBSERVER_JS = """
+if (!window.__scrollQuiet) {
+  window.__scrollQuiet = {last: performance.now()};
+  new MutationObserver(function () { window.__scrollQuiet.last = performance.now(); })
+    .observe(document.documentElement, {childList: true, subtree: true});
+}
+"""
+
+# [scrollHeight, matching card count, ms since last mutation, at bottom]
+STATE_JS = """
+var q = window.__scrollQuiet;
+var count = arguments[0] ? document.querySelectorAll(arguments[0]).length : 0;
+var h = document.body ? document.body.scrollHeight : 0;
+return [h, count, q ? performance.now() - q.last : 1e9,
+        window.scrollY + window.innerHeight >= h - 2];
+"""
+
+SCROLL_BOTTOM_JS = "window.scrollTo(0, document.body.scrollHeight);"
+SCROLL_PAGE_JS = "window.scrollBy(0, Math.floor(window.innerHeight * 0.9));"
+
+
+class ScrollResult(NamedTuple):
+    rounds: int
+    seconds: float
+    cards: int
+    reason: str  # "ready", "stable" or "max rounds"
+
+
+def is_present(driver, css: str) -> bool:
+    return bool(driver.find_elements(By.CSS_SELECTOR, css))
+
+
+def wait_present(driver, css: str, timeout: float) -> bool:
+    """Poll for `css` instead of sleeping a fixed time; False on timeout."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if is_present(driver, css):
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(POLL_SEC)
+
+
+def _settle(driver, count_css: Optional[str], quiet_sec: float, timeout: float):
+    """Wait until the DOM has been quiet for `quiet_sec` (at most `timeout`), then read the page state."""
+    deadline = time.monotonic() + timeout
+    while True:
+        time.sleep(POLL_SEC)
+        state = driver.execute_script(STATE_JS, count_css)
+        if state[2] >= quiet_sec * 1000 or time.monotonic() >= deadline:
+            return state
+
+
+def scroll_until_stable(driver, count_css: Optional[str] = None, ready_css: Optional[str] = None,
+                        max_rounds: int = 10, quiet_sec: float = 0.5, round_timeout: float = 3.0,
+                        by_page: bool = False, pause: Tuple[float, float] = (0.0, 0.0)) -> ScrollResult:
+    """Scroll until nothing new loads.
+
+    count_css: elements whose count must stop changing (e.g. result cards).
+    ready_css: stop immediately once present (e.g. a profile's h1).
+    by_page: scroll one viewport per round (human-like) instead of jumping to the bottom;
+             then "stable" also requires having reached the bottom.
+    pause: random extra delay range between rounds.
+    """
+    t0 = time.perf_counter()
+    if ready_css and is_present(driver, ready_css):
+        return ScrollResult(0, time.perf_counter() - t0, 0, "ready")
+
+    driver.execute_script(OBSERVER_JS)
+    last = driver.execute_script(STATE_JS, count_css)
+    for rounds in range(1, max_rounds + 1):
+        driver.execute_script(SCROLL_PAGE_JS if by_page else SCROLL_BOTTOM_JS)
+        height, count, _, at_bottom = _settle(driver, count_css, quiet_sec, round_timeout)
+        if ready_css and is_present(driver, ready_css):
+            return ScrollResult(rounds, time.perf_counter() - t0, count, "ready")
+        if (height, count) == (last[0], last[1]) and (at_bottom or not by_page):
+            return ScrollResult(rounds, time.perf_counter() - t0, count, "stable")
+        last = (height, count)
+        if pause[1] > 0:
+            time.sleep(random.uniform(*pause))
+    return ScrollResult(max_rounds, time.perf_counter() - t0, last[1], "max rounds")
+
+
+def log_scroll(label: str, result: ScrollResult, fixed_floor_sec: float = 0.0):
+    """One timing line per page; `fixed_floor_sec` is what the old fixed-sleep scroll would have taken."""
+    saved = f", ~{fixed_floor_sec - result.seconds:.1f}s saved" if fixed_floor_sec else ""
+    print(f"   ⏱ {label}: {result.rounds} scroll rounds, {result.cards} cards, "
+          f"{result.seconds:.1f}s ({result.reason}{saved})")
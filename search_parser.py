@@ -0,0 +1,225 @@
+import sys
+import time
+import glob
+from urllib.parse import urljoin
+from typing import List, Tuple, Optional
+
+from lxml import etree, html as lxml_html
+
+from debug_capture import read_page
+
+# search_parser.py
+# Offline parsing of LinkedIn people-search pages from raw HTML (driver.page_source
+# or a saved debug_page_*.html). Mirrors the Selenium selector fallbacks used in
+# Customer_Service_updated.scrape_pages and the open-to-work card scan in
+# wfg_lead_db_fixed.scan_search_page, in one lxml pass with no browser.
+
+BASE_URL = "https://www.linkedin.com"
+
+
+def _cls(name: str) -> str:
+    """XPath predicate equivalent to the CSS class selector `.name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# All /in/ links on the page (same as the //a[contains(@href,'/in/')] Selenium query)
+PROFILE_LINKS = etree.XPath("//a[contains(@href,'/in/')]")
+
+# Climb to a stable container around the profile link (same order as closest_card)
+CARD_ANCESTORS = [
+    etree.XPath("./ancestor::li[contains(@class,'reusable-search__result-container')][1]"),
+    etree.XPath("./ancestor::div[contains(@class,'reusable-search__result-container')][1]"),
+    etree.XPath("./ancestor::div[contains(@class,'entity-result')][1]"),
+    etree.XPath("./ancestor::li[1]"),
+    etree.XPath("./ancestor::div[1]"),
+]
+
+# Card field fallbacks, translated from the CSS/XPath selectors in scrape_pages
+NAME_SELECTORS = [
+    etree.XPath(f".//span[{_cls('entity-result__title-text')}]//a//span[@aria-hidden='true']"),
+    etree.XPath(".//span[@dir='ltr']"),
+]
+HEADLINE_SELECTORS = [
+    etree.XPath(f".//div[{_cls('entity-result__primary-subtitle')}]"),
+    etree.XPath(f".//div[{_cls('t-14')} and {_cls('t-normal')} and {_cls('t-black')}]"),
+]
+LOCATION_SELECTORS = [
+    etree.XPath(f".//div[{_cls('entity-result__secondary-subtitle')}]"),
+    etree.XPath(f".//div[{_cls('t-12')} and {_cls('t-normal')} and {_cls('t-black--light')}]"),
+    etree.XPath(".//span[@data-anonymize='location']"),
+]
+
+
+# wfg cards: nearest <li> around each profile link, and the open-to-work badge
+# anywhere in its attributes or text (case-insensitive)
+_LOWER = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+_BADGE = f"contains({_LOWER}, 'open to work') or contains({_LOWER}, 'opentowork')"
+PROFILE_LINKS_WITH_HREF = etree.XPath("//a[@href][contains(@href,'/in/')]")
+NEAREST_LI = etree.XPath("ancestor::li[1]")
+FIRST_LINK = etree.XPath("(.//a[@href])[1]")
+HAS_OPEN_TO_WORK = etree.XPath(f"boolean(descendant-or-self::*/@*[{_BADGE}] | .//text()[{_BADGE}])")
+
+# Profile top card, translated from profile_pool's NAME/HEADLINE/LOCATION_SELECTORS
+PROFILE_NAME_SELECTORS = [
+    etree.XPath("//h1"),
+    etree.XPath(f"//div[{_cls('ph5')}]//h1"),
+    etree.XPath("//*[@data-test-profile-card-headline]//h1"),
+]
+PROFILE_HEADLINE_SELECTORS = [
+    etree.XPath(f"//div[{_cls('text-body-medium')} and {_cls('break-words')}]"),
+    etree.XPath(f"//div[{_cls('text-body-medium')}]"),
+    etree.XPath("//div[contains(@class,'pv-text-details__left-panel')]/div[1]"),
+]
+PROFILE_LOCATION_SELECTORS = [
+    etree.XPath(f"//span[{_cls('text-body-small')} and {_cls('inline')} and {_cls('t-black--light')}"
+                f" and {_cls('break-words')}]"),
+    etree.XPath("//span[contains(@class,'text-body-small') and contains(.,',')]"),
+    etree.XPath("//div[contains(@class,'pv-text-details__left-panel')]//span[contains(@class,'text-body-small')]"),
+]
+
+# "2d •", "3w •", ... under each post on a /recent-activity/ page
+ACTIVITY_STAMPS = etree.XPath("//span[contains(@class,'update-components-actor__sub-description')]")
+
+
+def clean_url(href: Optional[str]) -> str:
+    """Absolute profile URL without the query string (what href_safe returns)."""
+    if not href:
+        return ""
+    return urljoin(BASE_URL, href).split("?", 1)[0]
+
+
+def node_text(el) -> str:
+    """Whitespace-normalized text of an element, close to Selenium's `.text`."""
+    return " ".join(el.text_content().split())
+
+
+def first_text(root, selectors) -> str:
+    """Text of the first selector that yields a non-empty match (like text_safe in a loop)."""
+    for sel in selectors:
+        found = sel(root)
+        if found:
+            t = node_text(found[0])
+            if t:
+                return t
+    return ""
+
+
+def closest_card(link_el):
+    for xp in CARD_ANCESTORS:
+        found = xp(link_el)
+        if found:
+            return found[0]
+    return None
+
+
+def parse_document(page_html: str):
+    return lxml_html.fromstring(page_html)
+
+
+def parse_search_cards(page_html: str) -> List[Tuple[str, str, str, str]]:
+    """Return (name, headline, location, profile_url) for every distinct /in/ link on a results page.
+
+    Cards are returned in document order; a profile URL that appears several times
+    (photo link, name link, ...) is reported once, from its first occurrence.
+    """
+    if not page_html:
+        return []
+    doc = parse_document(page_html)
+    seen = set()
+    cards = []
+    for link in PROFILE_LINKS(doc):
+        profile_url = clean_url(link.get("href"))
+        if not profile_url or "/in/" not in profile_url or profile_url in seen:
+            continue
+        seen.add(profile_url)
+
+        name, headline, location = "", "", ""
+        card = closest_card(link)
+        if card is not None:
+            name = first_text(card, NAME_SELECTORS)
+            headline = first_text(card, HEADLINE_SELECTORS)
+            location = first_text(card, LOCATION_SELECTORS)
+        cards.append((name, headline, location, profile_url))
+    return cards
+
+
+def parse_open_to_work_cards(page_html: str) -> Tuple[List[Tuple[str, bool]], List[str]]:
+    """(profile_url, open_to_work) per result card, plus a trimmed HTML snippet for each card without a valid link.
+
+    Cards are deduped by element identity and then by URL in sets, and the badge
+    is found with one XPath predicate rather than by re-serializing every card.
+    """
+    if not page_html:
+        return [], []
+    doc = parse_document(page_html)
+    seen_cards = set()
+    seen_urls = set()
+    cards: List[Tuple[str, bool]] = []
+    invalid: List[str] = []
+    for link in PROFILE_LINKS_WITH_HREF(doc):
+        found = NEAREST_LI(link)
+        if not found or found[0] in seen_cards:
+            continue
+        card = found[0]
+        seen_cards.add(card)
+
+        first = FIRST_LINK(card)
+        href = first[0].get("href") if first else ""
+        if "/in/" not in href:
+            invalid.append(etree.tostring(card, encoding="unicode")[:500])
+            continue
+        url = clean_url(href)
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        cards.append((url, HAS_OPEN_TO_WORK(card)))
+    return cards, invalid
+
+
+def parse_profile_top_card(page_html: str) -> Tuple[str, str, str]:
+    """(name, headline, location) from a saved profile page, same fallbacks as profile_pool.scrape_top_card."""
+    if not page_html:
+        return "", "", ""
+    doc = parse_document(page_html)
+    return (first_text(doc, PROFILE_NAME_SELECTORS),
+            first_text(doc, PROFILE_HEADLINE_SELECTORS),
+            first_text(doc, PROFILE_LOCATION_SELECTORS))
+
+
+def parse_activity_stamps(page_html: str) -> List[str]:
+    """Relative post times ("2d", "3 weeks ago", ...) from a saved /recent-activity/ page."""
+    if not page_html:
+        return []
+    return [node_text(el) for el in ACTIVITY_STAMPS(parse_document(page_html))]
+
+
+def main(paths: List[str]):
+    """Parse saved pages from the command line and report cards and pages/sec."""
+    files = []
+    for p in paths:
+        files.extend(sorted(glob.glob(p)) or [p])
+    if not files:
+        print("Usage: python search_parser.py debug_page_*.html debug_pages/*.html.gz")
+        return
+
+    total_cards = 0
+    elapsed = 0.0
+    for path in files:
+        page_html = read_page(path)
+        t0 = time.perf_counter()
+        cards = parse_search_cards(page_html)
+        badges, _ = parse_open_to_work_cards(page_html)
+        elapsed += time.perf_counter() - t0
+        total_cards += len(cards)
+        open_urls = {url for url, is_open in badges if is_open}
+        print(f"📄 {path}: {len(cards)} cards, {len(open_urls)} open to work")
+        for name, headline, location, url in cards:
+            badge = " [open to work]" if url in open_urls else ""
+            print(f"   • {name} | {headline} | {location} | {url}{badge}")
+
+    rate = len(files) / elapsed if elapsed else float("inf")
+    print(f"\n✅ Parsed {len(files)} pages, {total_cards} cards in {elapsed:.3f}s ({rate:.1f} pages/sec)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
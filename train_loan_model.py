@@ -1,71 +1,148 @@
+import argparse
+import multiprocessing as mp
+import pickle
+import resource
+import time
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score
-import pickle
+
+from loan_features import CSV_DTYPES, FEATURE_COLUMNS, build_pipeline
+from flat_forest import export_flat
+
+# train_loan_model.py
+#   python train_loan_model.py                                   # full retrain, compact dtypes, all cores
+#   python train_loan_model.py --mode incremental --new-data new_rows.csv --add-trees 20
+#   python train_loan_model.py --mode compare --scale 100        # default vs compact/parallel timings
+
+DATA_PATH = 'loan_dataset.csv'
+MODEL_PATH = 'loan_model.pkl'
+FLAT_MODEL_DIR = 'loan_model_flat'
+N_ESTIMATORS = 100
+
 
 # -------------------------------
 # 1️⃣ Load Dataset
 # -------------------------------
-data = pd.read_csv('loan_dataset.csv')
+def load_dataset(path: str, compact: bool = True, scale: int = 1) -> pd.DataFrame:
+    """Read the training CSV; `compact` uses category/float32 dtypes and skips unused columns."""
+    if compact:
+        data = pd.read_csv(path, usecols=FEATURE_COLUMNS + ['Loan_Status'], dtype=CSV_DTYPES)
+    else:
+        data = pd.read_csv(path)
+    if scale > 1:
+        data = pd.concat([data] * scale, ignore_index=True)
+    return data
 
-# Quick check
-print("Dataset Shape:", data.shape)
-print("Columns:", data.columns.tolist())
-print(data.head())
 
 # -------------------------------
-# 2️⃣ Handle Missing Values
+# 2️⃣ Define Features & Target
 # -------------------------------
-data.fillna({
-    'Gender': data['Gender'].mode()[0],
-    'Married': data['Married'].mode()[0],
-    'Dependents': data['Dependents'].mode()[0],
-    'Self_Employed': data['Self_Employed'].mode()[0],
-    'LoanAmount': data['LoanAmount'].median(),
-    'Loan_Amount_Term': data['Loan_Amount_Term'].median(),
-    'Credit_History': data['Credit_History'].mode()[0]
-}, inplace=True)
+def features_and_target(data: pd.DataFrame):
+    # Raw values in FEATURE_COLUMNS order: imputation and category encoding are
+    # part of the pipeline, so the app sends exactly what it receives.
+    X = data[FEATURE_COLUMNS].to_numpy(dtype=object)
+    y = data['Loan_Status'].map({'Y': 1, 'N': 0}).astype(np.int8).to_numpy()  # Convert Y/N to 1/0
+    return X, y
 
-# -------------------------------
-# 3️⃣ Encode Categorical Variables
-# -------------------------------
-categorical_cols = ['Gender', 'Married', 'Education', 'Self_Employed', 'Property_Area']
-le = LabelEncoder()
-for col in categorical_cols:
-    data[col] = le.fit_transform(data[col])
 
 # -------------------------------
-# 4️⃣ Define Features & Target
+# 3️⃣ Train Pipeline (impute + encode + model)
 # -------------------------------
-X = data[['ApplicantIncome','CoapplicantIncome','LoanAmount',
-          'Loan_Amount_Term','Credit_History']]
-y = data['Loan_Status'].map({'Y':1, 'N':0})  # Convert Y/N to 1/0
+def train_full(data: pd.DataFrame, n_jobs: int):
+    X, y = features_and_target(data)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    model = build_pipeline(RandomForestClassifier(n_estimators=N_ESTIMATORS, random_state=42, n_jobs=n_jobs))
+    model.fit(X_train, y_train)
+    return model, accuracy_score(y_test, model.predict(X_test))
 
-# -------------------------------
-# 5️⃣ Train-Test Split
-# -------------------------------
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-# -------------------------------
-# 6️⃣ Train Model
-# -------------------------------
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
+def train_incremental(model, new_data: pd.DataFrame, add_trees: int, n_jobs: int):
+    """Grow the existing forest with `add_trees` trees fitted on the new rows only (warm_start).
+
+    The fitted imputers/encoders are reused as-is, so earlier trees keep seeing
+    the same feature encoding.
+    """
+    X, y = features_and_target(new_data)
+    if len(np.unique(y)) < 2:
+        raise ValueError("new rows must contain both approved and rejected applications")
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    forest = model.named_steps['model']
+    forest.set_params(warm_start=True, n_estimators=forest.n_estimators + add_trees, n_jobs=n_jobs)
+    forest.fit(model.named_steps['features'].transform(X_train), y_train)
+    return model, accuracy_score(y_test, model.predict(X_test))
+
+
+def measured(label: str, fn, *args):
+    """Run fn(*args) and print wall time, peak RSS of this process and accuracy."""
+    t0 = time.perf_counter()
+    model, accuracy = fn(*args)
+    wall = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kB on Linux
+    print(f"⏱ {label:<28} wall {wall:7.2f}s | peak RSS {peak_mb:8.1f} MB | accuracy {accuracy * 100:6.2f}%")
+    return model
+
+
+def compare_run(label: str, path: str, compact: bool, scale: int, n_jobs: int):
+    # Load + fit end to end so dtype savings show up in both time and peak memory
+    measured(label, lambda: train_full(load_dataset(path, compact, scale), n_jobs))
 
-# -------------------------------
-# 7️⃣ Evaluate Model
-# -------------------------------
-y_pred = model.predict(X_test)
-accuracy = accuracy_score(y_test, y_pred)
-print(f"Model Accuracy: {accuracy*100:.2f}%")
 
 # -------------------------------
-# 8️⃣ Save Model
+# 4️⃣ Save Pipeline
 # -------------------------------
-with open('loan_model.pkl', 'wb') as f:
-    pickle.dump(model, f)
+def save(model):
+    with open(MODEL_PATH, 'wb') as f:
+        pickle.dump(model, f)
+    print(f"✅ Pipeline saved as {MODEL_PATH}")
+
+    # Compact mmap-able copy for fast app startup (flat node arrays + feature step)
+    export_flat(model, FLAT_MODEL_DIR)
+    print(f"✅ Flat forest exported to {FLAT_MODEL_DIR}/")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the loan approval pipeline.")
+    parser.add_argument('--mode', choices=['full', 'incremental', 'compare'], default='full')
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--new-data', help="labelled rows to grow the forest with (incremental mode)")
+    parser.add_argument('--add-trees', type=int, default=20)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="cores for tree fitting (-1 = all)")
+    parser.add_argument('--scale', type=int, default=1, help="repeat the dataset N times (benchmarking)")
+    args = parser.parse_args()
+
+    if args.mode == 'compare':
+        # Each configuration runs in a fresh process so its peak RSS is its own
+        ctx = mp.get_context('spawn')
+        for label, compact, n_jobs in [("default dtypes, 1 core", False, 1),
+                                       ("compact dtypes, all cores", True, args.n_jobs)]:
+            p = ctx.Process(target=compare_run, args=(label, args.data, compact, args.scale, n_jobs))
+            p.start()
+            p.join()
+        return
+
+    if args.mode == 'incremental':
+        if not args.new_data:
+            parser.error("--new-data is required in incremental mode")
+        with open(MODEL_PATH, 'rb') as f:
+            model = pickle.load(f)
+        new_data = load_dataset(args.new_data, True, args.scale)
+        print(f"New rows: {len(new_data)}")
+        model = measured(f"warm start +{args.add_trees} trees", train_incremental,
+                         model, new_data, args.add_trees, args.n_jobs)
+    else:
+        data = load_dataset(args.data, True, args.scale)
+        # Quick check
+        print("Dataset Shape:", data.shape)
+        print("Columns:", data.columns.tolist())
+        print(data.head())
+        model = measured("full retrain", train_full, data, args.n_jobs)
+
+    save(model)
+
 
-print("✅ Model saved as loan_model.pkl")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+import sqlite3
+import time
+from urllib.parse import urlsplit, unquote
+from typing import Iterable, Optional
+
+# url_index.py
+# Persistent cross-run index of profiles already handled, per scraper. Keys are
+# the canonical /in/ slug in a WITHOUT ROWID table (the primary-key B-tree is the
+# table), so a lookup is one index probe and the file stays close to the raw
+# slug bytes. Only SQLite's small page cache is resident, not the URL set.
+
+INDEX_PATH = "url_index.sqlite"
+CACHE_KB = 8 * 1024   # SQLite page cache per connection
+COMMIT_EVERY = 200    # adds batched per transaction
+
+
+def profile_slug(url: str) -> Optional[str]:
+    """Canonical key of a profile URL: the lowercased /in/<slug>, or None for non-profile URLs."""
+    path = urlsplit((url or "").strip()).path
+    if "/in/" not in path:
+        return None
+    slug = unquote(path.split("/in/", 1)[1].split("/", 1)[0]).strip().lower()
+    return slug or None
+
+
+def canonical_profile_url(url: str) -> str:
+    slug = profile_slug(url)
+    return f"https://www.linkedin.com/in/{slug}" if slug else url
+
+
+class UrlIndex:
+    """Set-like view of the profiles `source` has already processed (`url in index`, `index.add(url)`)."""
+
+    def __init__(self, path: str = INDEX_PATH, source: str = "default", commit_every: int = COMMIT_EVERY):
+        self.source = source
+        self.commit_every = commit_every
+        self.pending = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA cache_size=-{CACHE_KB}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " source TEXT NOT NULL, slug TEXT NOT NULL, first_seen INTEGER NOT NULL,"
+            " PRIMARY KEY (source, slug)) WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    def __contains__(self, url: str) -> bool:
+        slug = profile_slug(url)
+        if slug is None:
+            return False
+        return self.conn.execute("SELECT 1 FROM seen WHERE source = ? AND slug = ?",
+                                 (self.source, slug)).fetchone() is not None
+
+    def add(self, url: str):
+        slug = profile_slug(url)
+        if slug is None:
+            return
+        self.conn.execute("INSERT OR IGNORE INTO seen (source, slug, first_seen) VALUES (?, ?, ?)",
+                          (self.source, slug, int(time.time())))
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.flush()
+
+    def add_many(self, urls: Iterable[str]):
+        now = int(time.time())
+        rows = ((self.source, s, now) for s in map(profile_slug, urls) if s)
+        self.conn.executemany("INSERT OR IGNORE INTO seen (source, slug, first_seen) VALUES (?, ?, ?)", rows)
+        self.flush()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM seen WHERE source = ?", (self.source,)).fetchone()[0]
+
+    def flush(self):
+        self.conn.commit()
+        self.pending = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
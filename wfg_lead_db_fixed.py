@@ -1,140 +1,154 @@
-import csv
 import os
 import time
+import argparse
 import pickle
 import random
+from functools import partial
 import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup
+
+from search_parser import parse_open_to_work_cards, parse_profile_top_card
+from location_rules import is_us_location
+from lead_store import read_column, count_rows
+from lead_record import LeadRecord, CsvLeadWriter, ParquetLeadWriter, utc_now
+from debug_capture import DebugCapture
+from page_cache import PageCache
+from url_index import UrlIndex
+from scroll_control import scroll_until_stable, wait_present, log_scroll
+from scraper_cli import add_common_args, parse_args, page_range, configure_chrome, ensure_login
+from run_metrics import RunMetrics
 
 # ========================
 # CONFIGURATION
 # ========================
-EXCLUDE_CITY = "New York"
-US_KEYWORDS = ["united states", "usa"]
-START_PAGE = int(input("Enter start page (e.g., 1): "))
-END_PAGE = int(input("Enter end page (max 100): "))
-BATCH_SIZE = 5  # pages per session to reduce detection
+parser = argparse.ArgumentParser(description="Collect open-to-work US leads from LinkedIn people search.")
+parser.add_argument("--replay", action="store_true", help="re-run extraction and filters from the page cache only (no browser)")
+parser.add_argument("--no-index", action="store_true", help="ignore the cross-run URL index and revisit known profiles")
+add_common_args(parser)  # --start-page/--end-page/--config/--headless/--profile-dir/--non-interactive
+ARGS = parse_args(parser)
+REPLAY = ARGS.replay
+
+START_PAGE, END_PAGE = page_range(ARGS, parser, "max 100")
+BATCH_SIZE = 5  # pages per batch; one browser session for the whole run, cooldown between batches
 
 OUTPUT_CSV = f"linkedin_open_to_work_p{START_PAGE}_to_p{END_PAGE}.csv"
 ALL_PROFILES_CSV = f"linkedin_all_profiles_p{START_PAGE}_to_p{END_PAGE}.csv"
 COOKIES_FILE = "linkedin_cookies.pkl"
+FLUSH_EVERY = 10  # rows buffered before the CSVs are flushed/fsynced
+DEBUG_DIR = "debug_pages"  # gzipped page snapshots, oldest deleted past DEBUG_MAX_MB
+DEBUG_MAX_MB = 200
+DEBUG_SAMPLE_EVERY = 10  # keep 1 in N pages; pages with no cards are always kept
+PAGE_CACHE_PATH = "page_cache.sqlite"  # shared with the other scrapers
+PAGE_CACHE_TTL_HOURS = 24
+URL_INDEX_PATH = "url_index.sqlite"  # profiles handled by any earlier run, across page ranges
+PAGE_LOAD_TIMEOUT_SEC = 15
+SEARCH_READY_CSS = "ul.reusable-search__entity-result-list, li.reusable-search__result-container"
+RESULT_CARD_CSS = "li.reusable-search__result-container"
+PROFILE_READY_CSS = "h1"
+# What the old fixed sleeps cost per page (5-7 s load + 4-6 PAGE_DOWNs at 1.5-3 s + 2-4 s), for the timing log
+FIXED_SEARCH_SEC = 20.25
+FIXED_PROFILE_SEC = 14.25
+
+if REPLAY:
+    # Replay output is rebuilt from the cache each time, never resumed
+    OUTPUT_CSV = OUTPUT_CSV.replace(".csv", "_replay.csv")
+    ALL_PROFILES_CSV = ALL_PROFILES_CSV.replace(".csv", "_replay.csv")
+    for stale in (OUTPUT_CSV, ALL_PROFILES_CSV):
+        if os.path.exists(stale):
+            os.remove(stale)
 
 # ========================
 # FUNCTIONS
 # ========================
 def start_driver():
-    options = uc.ChromeOptions()
-    options.add_argument("--start-maximized")
-    driver = uc.Chrome(options=options)
-    return driver
+    return uc.Chrome(options=configure_chrome(uc.ChromeOptions(), ARGS))
 
 def save_cookies(driver):
     pickle.dump(driver.get_cookies(), open(COOKIES_FILE, "wb"))
 
 def load_cookies(driver):
-    driver.get("https://www.linkedin.com/")
-    time.sleep(3)
+    driver.get("https://www.linkedin.com/")  # get() returns once the page has loaded
     cookies = pickle.load(open(COOKIES_FILE, "rb"))
     for cookie in cookies:
         driver.add_cookie(cookie)
-    driver.refresh()
-    time.sleep(5)
 
 def ensure_logged_in(driver):
-    """Ensure manual login is complete and cookies saved."""
-    if os.path.exists(COOKIES_FILE):
+    """Reuse the saved browser profile (or the cookie file without one); manual login only as a fallback."""
+    if not ARGS.profile_dir and os.path.exists(COOKIES_FILE):
         print("✅ Loading cookies...")
         load_cookies(driver)
 
-    driver.get("https://www.linkedin.com/feed/")
-    time.sleep(5)
-
-    if "login" in driver.current_url or "checkpoint" in driver.current_url:
-        print("⚠ Manual login required. Please log in completely...")
-        print("➡ After login, navigate to your feed, then press ENTER here.")
-        input()
+    if ensure_login(driver, ARGS, "➡ After login, navigate to your feed, then press ENTER here."):
         save_cookies(driver)
-        print("✅ Cookies saved for future sessions.")
-    else:
-        print("✅ Logged in successfully!")
-
-def human_like_scroll(driver):
-    """Simulate human scrolling to trigger lazy load."""
-    for _ in range(random.randint(4, 6)):
-        driver.find_element(By.TAG_NAME, "body").send_keys(Keys.PAGE_DOWN)
-        time.sleep(random.uniform(1.5, 3.0))
-    time.sleep(random.uniform(2, 4))
-
-US_KEYWORDS = [
-    "united states", "usa", "u.s.", "california", "texas", "dc", "washington",
-    "los angeles", "san francisco", "new jersey", "boston", "chicago", "illinois",
-    "florida", "remote", "greater"
-]
-
-def is_us_location(location: str) -> bool:
-    if not location or location.lower() == "unknown":
-        return False
-    loc = location.lower()
-    return any(key in loc for key in US_KEYWORDS)
-
-
-def scan_search_page(driver, page_number, processed_urls):
+
+def human_like_scroll(driver, count_css=None):
+    """Page-by-page scrolling with short random pauses, stopping once nothing new loads."""
+    return scroll_until_stable(driver, count_css=count_css, max_rounds=12, by_page=True, pause=(0.3, 0.9))
+
+def load_search_page(driver, search_url):
+    t0 = time.perf_counter()
+    with metrics.stage("page_load"):
+        driver.get(search_url)
+    with metrics.stage("wait_results"):
+        if not wait_present(driver, SEARCH_READY_CSS, PAGE_LOAD_TIMEOUT_SEC):
+            metrics.incr("wait_timeouts", page="search")
+    with metrics.stage("scroll"):
+        result = human_like_scroll(driver, RESULT_CARD_CSS)
+    metrics.incr("scroll_rounds", result.rounds)
+    log_scroll("search page", result._replace(seconds=time.perf_counter() - t0), FIXED_SEARCH_SEC)
+    return driver.page_source
+
+def load_profile_page(driver, url):
+    # The top card is server-rendered: wait for the name instead of scrolling
+    t0 = time.perf_counter()
+    driver.get(url)
+    if not wait_present(driver, PROFILE_READY_CSS, PAGE_LOAD_TIMEOUT_SEC):
+        metrics.incr("wait_timeouts", page="profile")
+    elapsed = time.perf_counter() - t0
+    print(f"   ⏱ profile ready in {elapsed:.1f}s (~{FIXED_PROFILE_SEC - elapsed:.1f}s saved)")
+    return driver.page_source
+
+def already_processed(url):
+    return url in processed_urls or (url_index is not None and url in url_index)
+
+def scan_search_page(driver, page_number):
     search_url = f"https://www.linkedin.com/search/results/people/?geoUrn=%5B%22103644278%22%5D&page={page_number}"
-    driver.get(search_url)
     print(f"🔹 Scanning search results on page {page_number}...")
-    time.sleep(random.uniform(5, 7))
-
-    human_like_scroll(driver)
 
     page_all_urls = []
     page_open_urls = []
 
-    soup = BeautifulSoup(driver.page_source, "lxml")
-    # Flexible profile card matching: includes 'search' and 'result' in class name
-    profile_links = soup.find_all("a", href=True)
-    cards = []
-
-    for link in profile_links:
-        if "/in/" in link["href"]:
-            parent_li = link.find_parent("li")
-            if parent_li and parent_li not in cards:
-                cards.append(parent_li)
-
-    # Save debug HTML regardless of profile detection
-    debug_filename = f"debug_page_{page_number}.html"
-    with open(debug_filename, "w", encoding="utf-8") as f:
-        f.write(driver.page_source)
-        print(f"💾 Debug HTML saved: {debug_filename}")
-
-    # Check for cards
-    if not cards:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        with open(f"debug_page_{timestamp}.html", "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-        print(f"⚠️ No cards found. Saved HTML to debug_page_{timestamp}.html")
-
-        print(f"⚠ No profiles detected on page {page_number}.")
-
-    for idx, card in enumerate(cards, 1):
-        link = card.find("a", href=True)
-        if not link or "/in/" not in link["href"]:
-            print(f"⚠️ Card {idx}: No valid profile link found.")
-            print(card.prettify()[:500])  # Print trimmed HTML for inspection
+    t_page = time.perf_counter()
+    with metrics.stage("fetch_page"):
+        # Pages without result cards (login walls, empty loads) are not cached
+        page_source = page_cache.fetch(search_url, partial(load_search_page, driver, search_url), REPLAY,
+                                       valid=lambda html: any(parse_open_to_work_cards(html)))
+    if page_source is None:
+        print(f"⏩ Page {page_number} is not in the page cache, skipped")
+        metrics.incr("pages_skipped", reason="not_cached")
+        return page_all_urls, page_open_urls
+    # One lxml pass: nearest <li> per profile link, deduped, badge via XPath
+    with metrics.stage("parse_cards"):
+        cards, invalid = parse_open_to_work_cards(page_source)
+    metrics.incr("cards_seen", len(cards))
+    metrics.incr("selector_misses", len(invalid), field="profile_link")
+
+    # Snapshot written in the background: always when nothing was found, else sampled
+    failed = not cards and not invalid
+    if not REPLAY:
+        debug_capture.capture(f"wfg_page_{page_number}", page_source, failed=failed)
+    if failed:
+        print(f"⚠ No profiles detected on page {page_number}. HTML queued to {DEBUG_DIR}/")
+        metrics.incr("pages_without_cards")
+
+    for snippet in invalid:
+        print("⚠️ Card without a valid profile link:")
+        print(snippet)  # Trimmed HTML for inspection
+
+    for url, open_to_work in cards:
+        if already_processed(url):
+            metrics.incr("profiles_skipped", reason="processed")
             continue
 
-        url = link["href"].split("?")[0]
-        if url in processed_urls or url in page_all_urls:
-            continue
-
-        card_html = str(card).lower()
-        open_to_work = (
-            "open to work" in card_html
-            or "opentowork" in card_html
-            or 'alt="open to work"' in card_html
-        )
-
         page_all_urls.append(url)
         if open_to_work:
             page_open_urls.append(url)
@@ -142,104 +156,122 @@ def scan_search_page(driver, page_number, processed_urls):
         else:
             print(f"  ❌ No Open-to-Work badge: {url}")
 
+    metrics.observe("page_seconds", time.perf_counter() - t_page)
     return page_all_urls, page_open_urls
 
 def get_profile_data(driver, url):
-    driver.get(url)
-    human_like_scroll(driver)
-
-    try:
-        name = driver.find_element(By.XPATH, "//h1").text.strip()
-    except:
-        name = "Unknown"
-    try:
-        headline = driver.find_element(By.XPATH, "//div[contains(@class,'text-body-medium')]").text.strip()
-    except:
-        headline = "Unknown"
-    try:
-        location = driver.find_element(By.XPATH, "//span[contains(@class,'text-body-small')]").text.strip()
-    except:
-        location = "Unknown"
-
-    return name, headline, location
+    with metrics.stage("profile"):
+        page_source = page_cache.fetch(url, partial(load_profile_page, driver, url), REPLAY)
+        name, headline, location = parse_profile_top_card(page_source)
+    for field, value in (("name", name), ("headline", headline), ("location", location)):
+        if not value:
+            metrics.incr("selector_misses", field=field)
+    return name or "Unknown", headline or "Unknown", location or "Unknown"
 
 # ========================
 # STEP 1: Prepare CSV files
 # ========================
-if not os.path.exists(OUTPUT_CSV):
-    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Name", "Headline", "Location", "LinkedIn URL"])
-    open_to_work_results = []
-else:
-    with open(OUTPUT_CSV, "r", encoding="utf-8") as f:
-        open_to_work_results = list(csv.reader(f))[1:]
-
-if not os.path.exists(ALL_PROFILES_CSV):
-    with open(ALL_PROFILES_CSV, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Name", "Headline", "Location", "LinkedIn URL", "OpenToWork"])
-    all_profiles_results = []
-else:
-    with open(ALL_PROFILES_CSV, "r", encoding="utf-8") as f:
-        all_profiles_results = list(csv.reader(f))[1:]
-
-processed_urls = {row[3] for row in all_profiles_results}
+metrics = RunMetrics("wfg", f"p{START_PAGE}_to_p{END_PAGE}_{time.strftime('%Y%m%d_%H%M%S')}")
+debug_capture = DebugCapture(DEBUG_DIR, DEBUG_MAX_MB * 1024 * 1024, DEBUG_SAMPLE_EVERY)
+page_cache = PageCache(PAGE_CACHE_PATH, PAGE_CACHE_TTL_HOURS)
+
+# Rows are appended as they are scraped; ALL_PROFILES_CSV doubles as the
+# resume log, so only its URL column is read back on restart.
+open_to_work_csv = CsvLeadWriter(OUTPUT_CSV, "wfg_open_to_work", FLUSH_EVERY)
+all_profiles_csv = CsvLeadWriter(ALL_PROFILES_CSV, "wfg_all_profiles", FLUSH_EVERY, flush_first=[open_to_work_csv])
+leads_parquet = ParquetLeadWriter(ARGS.parquet_dir) if ARGS.parquet_dir else None  # every profile, one row each
+
+processed_urls = read_column(ALL_PROFILES_CSV, 3)
+open_to_work_count = count_rows(OUTPUT_CSV)
+all_profiles_count = len(processed_urls)
+
+# Replay re-filters everything in the cache, so it never consults the index
+url_index = None if REPLAY or ARGS.no_index else UrlIndex(URL_INDEX_PATH, "wfg")
+if url_index is not None:
+    url_index.add_many(processed_urls)  # carry over profiles resumed from the CSV
 
 # ========================
 # STEP 2: Process in batches
 # ========================
 current_page = START_PAGE
 
-while current_page <= END_PAGE:
-    batch_end = min(current_page + BATCH_SIZE - 1, END_PAGE)
-    print(f"\n=== Starting batch {current_page}-{batch_end} ===")
-
-    driver = start_driver()
-    ensure_logged_in(driver)
-
-    batch_all_urls = []
-    batch_open_urls = []
-
-    for page in range(current_page, batch_end + 1):
-        page_all, page_open = scan_search_page(driver, page, processed_urls)
-        batch_all_urls.extend(page_all)
-        batch_open_urls.extend(page_open)
-
-    for idx, url in enumerate(batch_all_urls, 1):
-        if url in processed_urls:
-            continue
-
-        name, headline, location = get_profile_data(driver, url)
-        is_open = url in batch_open_urls
-        is_us = is_us_location(location)
-
-        all_profiles_results.append([name, headline, location, url, "Yes" if is_open else "No"])
-
-        print(f"    └─ Open: {is_open}, US: {is_us}, Location: {location}")
-
-        if is_open and is_us and EXCLUDE_CITY.lower() not in location.lower():
-            open_to_work_results.append([name, headline, location, url])
-            print(f"[{idx}/{len(batch_all_urls)}] ✅ Saved Open-to-Work: {name} | {headline} | {location}")
-        else:
-            print(f"[{idx}/{len(batch_all_urls)}] ❌ Non-qualified or Excluded: {name}")
-
-        processed_urls.add(url)
-
-        with open(ALL_PROFILES_CSV, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Name", "Headline", "Location", "LinkedIn URL", "OpenToWork"])
-            writer.writerows(all_profiles_results)
-
-        with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Name", "Headline", "Location", "LinkedIn URL"])
-            writer.writerows(open_to_work_results)
-
-    driver.quit()
-    current_page = batch_end + 1
-    time.sleep(random.uniform(20, 35))  # cooldown
+driver = None
+try:
+    if not REPLAY:
+        driver = start_driver()
+        with metrics.stage("login"):
+            ensure_logged_in(driver)
+
+    while current_page <= END_PAGE:
+        batch_end = min(current_page + BATCH_SIZE - 1, END_PAGE)
+        print(f"\n=== Starting batch {current_page}-{batch_end} ===")
+
+        batch_all_urls = []
+        batch_open_urls = []
+        batch_done_urls = []
+
+        for page in range(current_page, batch_end + 1):
+            page_all, page_open = scan_search_page(driver, page)
+            batch_all_urls.extend(page_all)
+            batch_open_urls.extend(page_open)
+
+        for idx, url in enumerate(batch_all_urls, 1):
+            if already_processed(url):
+                continue
+
+            name, headline, location = get_profile_data(driver, url)
+            is_open = url in batch_open_urls
+            is_us = is_us_location(location)
+
+            print(f"    └─ Open: {is_open}, US: {is_us}, Location: {location}")
+            metrics.incr("profiles_processed")
+
+            lead = LeadRecord("wfg", metrics.run_id, url, name, headline, location, open_to_work=is_open,
+                              qualified=is_open and is_us, scraped_at=utc_now())
+
+            # Lead row first: the all-profiles row marks the URL as processed on resume
+            if lead.qualified:
+                open_to_work_csv.append(lead)
+                open_to_work_count += 1
+                print(f"[{idx}/{len(batch_all_urls)}] ✅ Saved Open-to-Work: {name} | {headline} | {location}")
+                metrics.incr("leads_saved")
+            else:
+                metrics.incr("filter_rejects", reason="not_open_to_work" if not is_open else "location")
+                print(f"[{idx}/{len(batch_all_urls)}] ❌ Non-qualified or Excluded: {name}")
+
+            all_profiles_csv.append(lead)
+            if leads_parquet is not None:
+                leads_parquet.append(lead)
+            all_profiles_count += 1
+            processed_urls.add(url)
+            batch_done_urls.append(url)
+
+        with metrics.stage("csv_write"):
+            all_profiles_csv.flush()  # flushes open_to_work_csv first
+        # Only URLs whose rows are on disk are marked as handled for later runs
+        if url_index is not None:
+            url_index.add_many(batch_done_urls)
+        current_page = batch_end + 1
+        if driver is not None and current_page <= END_PAGE:
+            with metrics.stage("cooldown"):
+                time.sleep(random.uniform(20, 35))  # cooldown between batches, same session
+finally:
+    if driver is not None:
+        driver.quit()
+    all_profiles_csv.close()
+    open_to_work_csv.close()
+    if leads_parquet is not None:
+        leads_parquet.close()
+    debug_capture.close()
+    page_cache.close()
+    if url_index is not None:
+        url_index.close()
+    metrics.incr("page_cache", page_cache.hits, result="hit")
+    metrics.incr("page_cache", page_cache.misses, result="miss")
+    metrics.incr("page_cache", page_cache.rejected, result="rejected")
+    metrics.finish(ARGS.metrics_dir, ARGS.prom_textfile)
 
 print(f"\n🎉 Scraping completed.")
-print(f"  • {len(open_to_work_results)} Open-to-Work leads saved to {OUTPUT_CSV}")
-print(f"  • {len(all_profiles_results)} total profiles saved to {ALL_PROFILES_CSV}")
+print(f"  • {open_to_work_count} Open-to-Work leads saved to {OUTPUT_CSV}")
+print(f"  • {all_profiles_count} total profiles saved to {ALL_PROFILES_CSV}")
+print(f"  • page cache hits {page_cache.hits} / misses {page_cache.misses}")
@@ -0,0 +1,286 @@
+import os
+import re
+import glob
+import gzip
+import json
+import time
+import uuid
+import argparse
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# zillow_ingest.py
+# Streams zillow_apify_actor output (records shaped by mapZillowItem in
+# src/routers.js) into a typed Parquet dataset partitioned by state:
+#
+#   zillow_parquet/state=TX/part-<run>.parquet
+#
+# Inputs are read record by record: Apify local storage dirs
+# (storage/datasets/default/*.json), exported JSON arrays, or JSON lines (.jsonl/.ndjson),
+# optionally gzipped. Records are deduplicated on zpid against everything
+# already in the dataset, so re-running on new dumps only appends new listings.
+#
+#   python zillow_ingest.py storage/datasets/default dataset_2024-05.json.gz --out zillow_parquet
+
+# ====== CONFIG ======
+OUT_DIR = "zillow_parquet"
+BATCH_ROWS = 50_000      # records converted and written per batch
+READ_CHUNK = 1 << 20     # characters per read when streaming a JSON array
+UNKNOWN_STATE = "unknown"
+# ====================
+
+SCHEMA = pa.schema([
+    ("zpid", pa.int64()),
+    ("url", pa.string()),
+    ("referer", pa.string()),
+    ("address", pa.string()),
+    ("statusType", pa.dictionary(pa.int16(), pa.string())),
+    ("statusText", pa.string()),
+    ("label", pa.string()),
+    ("homeType", pa.dictionary(pa.int16(), pa.string())),
+    ("priceRaw", pa.float64()),
+    ("priceText", pa.string()),
+    ("beds", pa.float32()),
+    ("baths", pa.float32()),
+    ("areaSqft", pa.float64()),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("yearBuilt", pa.int16()),
+    ("lotArea", pa.float64()),
+    ("lotAreaUnit", pa.dictionary(pa.int16(), pa.string())),
+    ("timeOnZillow", pa.int64()),
+    ("scrapedAt", pa.timestamp("ms", tz="UTC")),
+])
+# Integer columns and the range their Arrow type holds; values outside it are stored as null
+INT_FIELDS = {name: np.iinfo(SCHEMA.field(name).type.to_pandas_dtype())
+              for name in ("zpid", "yearBuilt", "timeOnZillow")}
+FLOAT_FIELDS = {"priceRaw", "beds", "baths", "areaSqft", "latitude", "longitude", "lotArea"}
+
+# "123 Main St, Austin, TX 78701" / "Austin, TX"
+STATE_RE = re.compile(r",\s*([A-Z]{2})(?:\s+\d{5}(?:-\d{4})?)?\s*$")
+
+
+# -------------------------------
+# Reading
+# -------------------------------
+def _open_text(path: str):
+    opener = gzip.open if path.endswith(".gz") else open
+    return opener(path, "rt", encoding="utf-8")
+
+
+def iter_json_array(f, chunk_size: int = READ_CHUNK) -> Iterator[dict]:
+    """Yield the elements of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buf, idx, eof = "", 0, False
+
+    def refill():
+        nonlocal buf, idx, eof
+        data = f.read(chunk_size)
+        eof = not data
+        buf, idx = buf[idx:] + data, 0
+
+    refill()
+    while True:
+        while idx < len(buf) and buf[idx] in " \t\r\n,[":
+            idx += 1
+        if idx >= len(buf):
+            if eof:
+                return
+            refill()
+            continue
+        if buf[idx] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, idx)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            refill()
+            continue
+        if end == len(buf) and not eof:
+            refill()  # the value may continue in the next chunk
+            continue
+        yield obj
+        idx = end
+        if idx > chunk_size:
+            buf, idx = buf[idx:], 0
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Records from an Apify dataset dir, a JSON array file or a JSON-lines file."""
+    if os.path.isdir(path):
+        for item in sorted(glob.glob(os.path.join(path, "*.json"))):
+            with open(item, "r", encoding="utf-8") as f:
+                yield json.load(f)
+        return
+    with _open_text(path) as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        if first == "[":
+            yield from iter_json_array(f)
+            return
+        line = first + f.readline()
+        while line:
+            if line.strip():
+                yield json.loads(line)
+            line = f.readline()
+
+
+# -------------------------------
+# Typing
+# -------------------------------
+def state_of(address) -> str:
+    m = STATE_RE.search(address or "") if isinstance(address, str) else None
+    return m.group(1) if m else UNKNOWN_STATE
+
+
+def _number(value, as_int: bool, bounds=None):
+    if value is None or value == "":
+        return None
+    try:
+        number = int(float(value)) if as_int else float(value)
+    except (TypeError, ValueError, OverflowError):  # OverflowError: int(float("1e400"))
+        return None
+    if bounds is not None and not bounds.min <= number <= bounds.max:
+        return None
+    return number
+
+
+def _timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def to_columns(records: List[dict]) -> Dict[str, list]:
+    """Column lists in SCHEMA order (plus the partition column); records without a zpid are dropped."""
+    cols: Dict[str, list] = {name: [] for name in SCHEMA.names}
+    cols["state"] = []
+    for rec in records:
+        zpid = _number(rec.get("zpid"), as_int=True, bounds=INT_FIELDS["zpid"])
+        if zpid is None:
+            continue
+        for name in SCHEMA.names:
+            value = rec.get(name)
+            if name == "zpid":
+                value = zpid
+            elif name in INT_FIELDS:
+                value = _number(value, as_int=True, bounds=INT_FIELDS[name])
+            elif name in FLOAT_FIELDS:
+                value = _number(value, as_int=False)
+            elif name == "scrapedAt":
+                value = _timestamp(value)
+            elif value is not None and not isinstance(value, str):
+                value = str(value)
+            cols[name].append(value)
+        cols["state"].append(state_of(rec.get("address")))
+    return cols
+
+
+# -------------------------------
+# Writing
+# -------------------------------
+def existing_zpids(out_dir: str) -> np.ndarray:
+    """Sorted zpids already in the dataset (reads only that column)."""
+    parts = [pq.read_table(p, columns=["zpid"]).column("zpid").to_numpy()
+             for p in glob.glob(os.path.join(out_dir, "state=*", "*.parquet"))]
+    return np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+
+
+class PartitionedWriter:
+    """One Parquet file per state for this run, appended to batch by batch."""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.run = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.writers: Dict[str, pq.ParquetWriter] = {}
+
+    def write(self, table: pa.Table, states: np.ndarray):
+        for state in np.unique(states):
+            part = table.filter(pa.array(states == state))
+            writer = self.writers.get(state)
+            if writer is None:
+                directory = os.path.join(self.out_dir, f"state={state}")
+                os.makedirs(directory, exist_ok=True)
+                writer = pq.ParquetWriter(os.path.join(directory, f"part-{self.run}.parquet"), SCHEMA,
+                                          compression="zstd")
+                self.writers[state] = writer
+            writer.write_table(part)
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+
+
+def ingest(paths: List[str], out_dir: str = OUT_DIR, batch_rows: int = BATCH_ROWS) -> dict:
+    known = existing_zpids(out_dir)
+    stats = {"read": 0, "written": 0, "duplicates": 0, "no_zpid": 0, "existing": len(known)}
+    writer = PartitionedWriter(out_dir)
+
+    def flush(records):
+        nonlocal known
+        cols = to_columns(records)
+        stats["no_zpid"] += len(records) - len(cols["zpid"])
+        zpids = np.asarray(cols["zpid"], dtype=np.int64)
+        # First occurrence within the batch, and not already stored
+        _, first = np.unique(zpids, return_index=True)
+        keep = np.zeros(len(zpids), dtype=bool)
+        keep[first] = True
+        if len(known):
+            keep &= ~np.isin(zpids, known)
+        stats["duplicates"] += len(zpids) - int(keep.sum())
+        if keep.any():
+            idx = np.flatnonzero(keep)
+            table = pa.table({name: pa.array(cols[name], type=pa.string() if pa.types.is_dictionary(field.type)
+                                             else field.type)
+                              for name, field in zip(SCHEMA.names, SCHEMA)}).take(idx).cast(SCHEMA)
+            writer.write(table, np.asarray(cols["state"], dtype=object)[idx])
+            stats["written"] += len(idx)
+            known = np.union1d(known, zpids[idx])
+
+    try:
+        for path in paths:
+            batch = []
+            for rec in iter_records(path):
+                batch.append(rec)
+                stats["read"] += 1
+                if len(batch) >= batch_rows:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+            print(f"📥 {path}: {stats['read']} records read so far")
+    finally:
+        writer.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load zillow_apify_actor output into a partitioned Parquet dataset.")
+    parser.add_argument("inputs", nargs="+", help="dataset dirs, .json arrays or .jsonl files (optionally .gz)")
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS)
+    args = parser.parse_args()
+
+    paths = []
+    for p in args.inputs:
+        paths.extend(sorted(glob.glob(p)) or [p])
+    t0 = time.perf_counter()
+    stats = ingest(paths, args.out, args.batch_rows)
+    elapsed = time.perf_counter() - t0
+    print(f"✅ {stats['written']} new listings written to {args.out}/ "
+          f"({stats['duplicates']} duplicate zpids skipped, {stats['no_zpid']} without zpid, "
+          f"{stats['existing']} already stored) in {elapsed:.1f}s "
+          f"({stats['read'] / elapsed if elapsed else 0:.0f} records/sec)")
+
+
+if __name__ == "__main__":
+    main()